@@ -0,0 +1,28 @@
+"""Fixtures for the benchmarks of the Artificial Sunlight integration.
+
+The benchmarks run against the fake of `HomeAssistant` in `helpers`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from .helpers import make_hass
+
+
+@pytest.fixture
+def event_loop():
+    """Create an event loop for the async benchmarks."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def hass(event_loop):
+    """Create a fake Home Assistant with the shared integration data."""
+    hass = make_hass(event_loop)
+    yield hass
+    event_loop.run_until_complete(hass.async_block_till_done())
@@ -0,0 +1,284 @@
+"""Helpers for the benchmarks of the Artificial Sunlight integration.
+
+A lightweight fake of `HomeAssistant` that only implements the parts of the
+states, bus and services the integration uses, so the measured time is spent
+in the integration itself, and functions to add lights and switches to it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import os
+from types import SimpleNamespace
+from typing import Any, Callable, Optional
+
+import astral
+import astral.location
+from homeassistant.const import (
+    ATTR_DOMAIN,
+    ATTR_ENTITY_ID,
+    ATTR_SERVICE,
+    ATTR_SERVICE_DATA,
+    EVENT_CALL_SERVICE,
+    EVENT_STATE_CHANGED,
+    STATE_ON,
+)
+from homeassistant.core import Context, Event, State
+
+from custom_components.artificial_sunlight.const import (
+    ATTR_COMMAND_SCHEDULER,
+    ATTR_EPHEMERIS_CACHE,
+    ATTR_LIGHT_GROUPS,
+    ATTR_LIGHT_PROFILES,
+    ATTR_TURN_ON_OFF_LISTENER,
+    CONF_LIGHTS,
+    CONF_NAME,
+    DOMAIN,
+)
+from custom_components.artificial_sunlight.switch import (
+    ArtifSunSwitch,
+    CommandScheduler,
+    EphemerisCache,
+    LightGroupIndex,
+    LightProfileCache,
+    SimpleSwitch,
+    TurnOnOffListener,
+)
+
+LATITUDE, LONGITUDE, ELEVATION = 52.37, 4.89, 0.0
+NOW = datetime.datetime(2021, 6, 21, 12, 0, tzinfo=datetime.timezone.utc)
+
+# Attributes of a light that supports brightness, color_temp and color
+LIGHT_ATTRIBUTES = {
+    "supported_features": 63,
+    "supported_color_modes": ["color_temp", "hs"],
+    "min_mireds": 153,
+    "max_mireds": 500,
+    "brightness": 128,
+    "color_temp": 300,
+}
+
+
+class FakeStates:
+    """Fake of `homeassistant.core.StateMachine`."""
+
+    def __init__(self, bus: FakeBus) -> None:
+        self._bus = bus
+        self._states: dict[str, State] = {}
+
+    def get(self, entity_id: str) -> Optional[State]:
+        return self._states.get(entity_id)
+
+    def is_state(self, entity_id: str, state: str) -> bool:
+        current = self._states.get(entity_id)
+        return current is not None and current.state == state
+
+    def async_entity_ids(self, domain_filter: Optional[str] = None) -> list[str]:
+        return [
+            entity_id
+            for entity_id in self._states
+            if domain_filter is None or entity_id.startswith(f"{domain_filter}.")
+        ]
+
+    def async_set(
+        self,
+        entity_id: str,
+        new_state: str,
+        attributes: Optional[dict[str, Any]] = None,
+        context: Optional[Context] = None,
+    ) -> None:
+        old_state = self._states.get(entity_id)
+        state = self._states[entity_id] = State(
+            entity_id, new_state, attributes, context=context
+        )
+        self._bus.async_fire(
+            EVENT_STATE_CHANGED,
+            {"entity_id": entity_id, "old_state": old_state, "new_state": state},
+            context=context,
+        )
+
+
+class FakeBus:
+    """Fake of `homeassistant.core.EventBus`."""
+
+    def __init__(self, hass: FakeHass) -> None:
+        self._hass = hass
+        self._listeners: dict[str, list[tuple[Callable, Optional[Callable]]]] = {}
+
+    def async_listen(
+        self,
+        event_type: str,
+        listener: Callable,
+        event_filter: Optional[Callable] = None,
+    ) -> Callable[[], None]:
+        job = (listener, event_filter)
+        self._listeners.setdefault(event_type, []).append(job)
+        return lambda: self._listeners[event_type].remove(job)
+
+    def async_listen_once(self, event_type: str, listener: Callable):
+        return self.async_listen(event_type, listener)
+
+    def async_fire(
+        self,
+        event_type: str,
+        event_data: Optional[dict[str, Any]] = None,
+        context: Optional[Context] = None,
+    ) -> None:
+        event = Event(event_type, event_data or {}, context=context)
+        for listener, event_filter in list(self._listeners.get(event_type, [])):
+            if event_filter is not None and not event_filter(event):
+                continue
+            result = listener(event)
+            if asyncio.iscoroutine(result):
+                self._hass.async_create_task(result)
+
+    fire = async_fire
+
+
+class FakeServices:
+    """Fake of `homeassistant.core.ServiceRegistry` that 'handles' lights."""
+
+    def __init__(self, hass: FakeHass) -> None:
+        self._hass = hass
+        self.calls: list[tuple[str, str, dict[str, Any]]] = []
+
+    async def async_call(
+        self,
+        domain: str,
+        service: str,
+        service_data: Optional[dict[str, Any]] = None,
+        blocking: bool = False,
+        context: Optional[Context] = None,
+    ) -> None:
+        service_data = service_data or {}
+        self.calls.append((domain, service, service_data))
+        self._hass.bus.async_fire(
+            EVENT_CALL_SERVICE,
+            {
+                ATTR_DOMAIN: domain,
+                ATTR_SERVICE: service,
+                ATTR_SERVICE_DATA: service_data,
+            },
+            context=context,
+        )
+        entity_ids = service_data.get(ATTR_ENTITY_ID, [])
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        for entity_id in entity_ids:
+            state = self._hass.states.get(entity_id)
+            attributes = dict(state.attributes) if state is not None else {}
+            attributes.update(
+                (key, value)
+                for key, value in service_data.items()
+                if key in ("brightness", "color_temp", "rgb_color")
+            )
+            self._hass.states.async_set(entity_id, STATE_ON, attributes, context)
+
+    def has_service(self, domain: str, service: str) -> bool:
+        return False
+
+
+class FakeHass:
+    """Lightweight fake of `homeassistant.core.HomeAssistant`."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.data: dict[str, Any] = {}
+        self.is_running = True
+        self.bus = FakeBus(self)
+        self.states = FakeStates(self.bus)
+        self.services = FakeServices(self)
+        self.config = SimpleNamespace(
+            time_zone="UTC",
+            latitude=LATITUDE,
+            longitude=LONGITUDE,
+            elevation=ELEVATION,
+            config_dir=os.getcwd(),
+        )
+        self.helpers = SimpleNamespace(
+            entity_component=SimpleNamespace(async_update_entity=self._noop)
+        )
+        self._tasks: list[asyncio.Task] = []
+
+    @staticmethod
+    async def _noop(*args, **kwargs) -> None:
+        return None
+
+    def async_create_task(self, target) -> asyncio.Task:
+        task = self.loop.create_task(target)
+        self._tasks.append(task)
+        return task
+
+    def async_run_hass_job(self, hassjob, *args) -> None:
+        # Used by the `async_track_*` helpers of Home Assistant
+        result = hassjob.target(*args)
+        if asyncio.iscoroutine(result):
+            self.async_create_task(result)
+
+    async def async_block_till_done(self) -> None:
+        while self._tasks:
+            tasks, self._tasks = self._tasks, []
+            await asyncio.gather(*tasks)
+
+
+def make_hass(loop: asyncio.AbstractEventLoop) -> FakeHass:
+    """Create a fake Home Assistant with the shared integration data."""
+    hass = FakeHass(loop)
+    hass.data[DOMAIN] = {
+        ATTR_TURN_ON_OFF_LISTENER: TurnOnOffListener(hass),
+        ATTR_EPHEMERIS_CACHE: EphemerisCache(),
+        ATTR_COMMAND_SCHEDULER: CommandScheduler(hass),
+        ATTR_LIGHT_PROFILES: LightProfileCache(),
+        ATTR_LIGHT_GROUPS: LightGroupIndex(hass),
+    }
+    return hass
+
+
+def make_lights(hass: FakeHass, n_lights: int) -> list[str]:
+    """Add 'n_lights' lights that are 'on' to the fake state machine."""
+    lights = [f"light.bench_{index}" for index in range(n_lights)]
+    for light in lights:
+        hass.states.async_set(light, STATE_ON, dict(LIGHT_ATTRIBUTES))
+    return lights
+
+
+def make_location() -> astral.location.Location:
+    """Create the astral location of the fake Home Assistant instance."""
+    return astral.location.Location(
+        astral.LocationInfo("bench", "", "UTC", LATITUDE, LONGITUDE)
+    )
+
+
+def make_switch(hass: FakeHass, lights: list[str], **options: Any) -> ArtifSunSwitch:
+    """Create an `ArtifSunSwitch` that is 'on' and controls 'lights'."""
+    name = f"bench_{len(hass.data[DOMAIN])}"
+    config_entry = SimpleNamespace(
+        entry_id=name,
+        data={CONF_NAME: name, CONF_LIGHTS: lights},
+        options=options,
+        source="user",
+    )
+    hass.data[DOMAIN][config_entry.entry_id] = {}
+    sleep_mode_switch = SimpleSwitch("Sleep Mode", False, hass, config_entry)
+    adapt_color_switch = SimpleSwitch("Adapt Color", True, hass, config_entry)
+    adapt_brightness_switch = SimpleSwitch("Adapt Brightness", True, hass, config_entry)
+    for simple_switch, state in (
+        (sleep_mode_switch, False),
+        (adapt_color_switch, True),
+        (adapt_brightness_switch, True),
+    ):
+        simple_switch._state = state  # pylint: disable=protected-access
+    switch = ArtifSunSwitch(
+        hass,
+        config_entry,
+        hass.data[DOMAIN][ATTR_TURN_ON_OFF_LISTENER],
+        sleep_mode_switch,
+        adapt_color_switch,
+        adapt_brightness_switch,
+        (make_location(), ELEVATION),
+    )
+    switch.entity_id = f"switch.artificial_sunlight_{name}"
+    switch._state = True  # pylint: disable=protected-access
+    switch._expand_light_groups()  # pylint: disable=protected-access
+    return switch
@@ -0,0 +1,169 @@
+"""Benchmarks of the hot paths of the Artificial Sunlight integration."""
+
+from __future__ import annotations
+
+import datetime
+
+import pytest
+from homeassistant.core import Context
+
+from custom_components.artificial_sunlight.switch import (
+    _attributes_have_changed,
+    _expand_light_groups,
+    _supported_features,
+    create_context,
+)
+
+from .helpers import LIGHT_ATTRIBUTES, NOW, make_lights, make_switch
+
+N_LIGHTS = (10, 100, 1000)
+
+
+@pytest.fixture
+def switch(hass):
+    """Create a switch that controls 10 lights."""
+    return make_switch(hass, make_lights(hass, 10))
+
+
+def test_get_settings(benchmark, switch):
+    sun_settings = switch._sun_light_settings  # pylint: disable=protected-access
+    minutes = iter(range(10**9))
+
+    def get_settings():
+        now = NOW + datetime.timedelta(minutes=next(minutes) % (24 * 60))
+        return sun_settings.get_settings(False, 45, now=now)
+
+    benchmark(get_settings)
+
+
+def test_get_settings_sleep(benchmark, switch):
+    sun_settings = switch._sun_light_settings  # pylint: disable=protected-access
+    benchmark(sun_settings.get_settings, True, 45, now=NOW)
+
+
+def test_get_sun_events(benchmark, switch):
+    sun_settings = switch._sun_light_settings  # pylint: disable=protected-access
+    benchmark(sun_settings.get_sun_events, NOW)
+
+
+def test_attributes_have_changed(benchmark):
+    new_attributes = dict(LIGHT_ATTRIBUTES, brightness=130, color_temp=305)
+    benchmark(
+        _attributes_have_changed,
+        light="light.bench_0",
+        old_attributes=LIGHT_ATTRIBUTES,
+        new_attributes=new_attributes,
+        adapt_brightness=True,
+        adapt_color=True,
+        context=Context(),
+    )
+
+
+def test_supported_features(benchmark, hass):
+    make_lights(hass, 1)
+    benchmark(_supported_features, hass, "light.bench_0")
+
+
+@pytest.mark.parametrize("n_lights", N_LIGHTS)
+def test_expand_light_groups(benchmark, hass, n_lights):
+    lights = make_lights(hass, n_lights)
+    groups = [f"light.group_{index}" for index in range(0, n_lights, 10)]
+    for index, group in enumerate(groups):
+        hass.states.async_set(
+            group, "on", {"entity_id": lights[10 * index : 10 * (index + 1)]}
+        )
+    benchmark(_expand_light_groups, hass, groups)
+
+
+@pytest.mark.parametrize("n_lights", N_LIGHTS)
+def test_expand_nested_light_groups_after_change(benchmark, hass, n_lights):
+    lights = make_lights(hass, n_lights)
+    groups = [f"light.group_{index}" for index in range(0, n_lights, 10)]
+    for index, group in enumerate(groups):
+        hass.states.async_set(
+            group, "on", {"entity_id": lights[10 * index : 10 * (index + 1)]}
+        )
+    hass.states.async_set("light.all", "on", {"entity_id": groups})
+    _expand_light_groups(hass, ["light.all"])
+
+    def change_membership_and_expand():
+        members = hass.states.get(groups[0]).attributes["entity_id"]
+        hass.states.async_set(groups[0], "on", {"entity_id": members[::-1]})
+        return _expand_light_groups(hass, ["light.all"])
+
+    assert len(change_membership_and_expand()) == n_lights
+    benchmark(change_membership_and_expand)
+
+
+def test_create_context(benchmark):
+    benchmark(create_context, "bench", "interval", 123456, parent=Context())
+
+
+def test_context_factory(benchmark, hass):
+    switch = make_switch(hass, make_lights(hass, 1))
+    benchmark(switch.create_context, "interval", parent=Context())
+
+
+@pytest.mark.parametrize("n_lights", N_LIGHTS)
+def test_update_attrs_and_maybe_adapt_lights(benchmark, hass, n_lights):
+    # Send every pass, not only the first one
+    switch = make_switch(
+        hass, make_lights(hass, n_lights), skip_unchanged_commands=False
+    )
+
+    async def update():
+        await switch._update_attrs_and_maybe_adapt_lights(  # pylint: disable=protected-access
+            transition=0, force=False, context=switch.create_context("interval")
+        )
+        await hass.async_block_till_done()
+
+    benchmark.pedantic(
+        hass.loop.run_until_complete,
+        setup=lambda: ((update(),), {}),
+        rounds=max(5, 1000 // n_lights),
+    )
+
+
+@pytest.mark.parametrize("n_lights", N_LIGHTS)
+def test_update_attrs_and_maybe_adapt_lights_batched(benchmark, hass, n_lights):
+    switch = make_switch(
+        hass,
+        make_lights(hass, n_lights),
+        batch_turn_on_commands=True,
+        skip_unchanged_commands=False,
+    )
+
+    async def update():
+        await switch._update_attrs_and_maybe_adapt_lights(  # pylint: disable=protected-access
+            transition=0, force=False, context=switch.create_context("interval")
+        )
+        await hass.async_block_till_done()
+
+    benchmark.pedantic(
+        hass.loop.run_until_complete,
+        setup=lambda: ((update(),), {}),
+        rounds=max(5, 1000 // n_lights),
+    )
+
+
+@pytest.mark.parametrize("n_lights", N_LIGHTS)
+def test_update_attrs_and_maybe_adapt_lights_unchanged(benchmark, hass, n_lights):
+    switch = make_switch(
+        hass, make_lights(hass, n_lights), skip_unchanged_commands=True
+    )
+
+    async def update():
+        await switch._update_attrs_and_maybe_adapt_lights(  # pylint: disable=protected-access
+            transition=0, force=False, context=switch.create_context("interval")
+        )
+        await hass.async_block_till_done()
+
+    # After the first pass every light is skipped by the deadband
+    hass.loop.run_until_complete(update())
+    n_calls = len(hass.services.calls)
+    benchmark.pedantic(
+        hass.loop.run_until_complete,
+        setup=lambda: ((update(),), {}),
+        rounds=max(5, 1000 // n_lights),
+    )
+    assert len(hass.services.calls) == n_calls
@@ -11,15 +11,29 @@ import homeassistant.helpers.config_validation as cv
 
 from .const import (
     _DOMAIN_SCHEMA,
+    ATTR_COMMAND_SCHEDULER,
+    ATTR_EPHEMERIS_CACHE,
+    ATTR_LIGHT_GROUPS,
+    ATTR_LIGHT_PROFILES,
     ATTR_TURN_ON_OFF_LISTENER,
     CONF_NAME,
     DOMAIN,
     UNDO_UPDATE_LISTENER,
 )
+from .profiler import async_register_profile_service
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = ["switch"]
+PLATFORMS = ["switch", "sensor"]
+
+# Objects in `hass.data[DOMAIN]` that are shared by all config entries
+_SHARED_DATA = {
+    ATTR_TURN_ON_OFF_LISTENER,
+    ATTR_EPHEMERIS_CACHE,
+    ATTR_COMMAND_SCHEDULER,
+    ATTR_LIGHT_PROFILES,
+    ATTR_LIGHT_GROUPS,
+}
 
 
 def _all_unique_names(value):
@@ -38,6 +52,7 @@ CONFIG_SCHEMA = vol.Schema(
 ########  First - Async import config data  ########
 async def async_setup(hass: HomeAssistant, config: dict[str, Any]):
     """Import integration from config."""
+    async_register_profile_service(hass)
 
     if DOMAIN in config:
         for entry in config[DOMAIN]:
@@ -73,19 +88,25 @@ async def async_update_options(hass, config_entry: ConfigEntry):
 ########  unload integration component  ########
 async def async_unload_entry(hass, config_entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    unload_ok = await hass.config_entries.async_forward_entry_unload(
-        config_entry, "switch"
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        config_entry, PLATFORMS
     )
     data = hass.data[DOMAIN]
     data[config_entry.entry_id][UNDO_UPDATE_LISTENER]()
     if unload_ok:
         data.pop(config_entry.entry_id)
 
-    if len(data) == 1 and ATTR_TURN_ON_OFF_LISTENER in data:
+    if data.keys() <= _SHARED_DATA:
         # no more config_entries
-        turn_on_off_listener = data.pop(ATTR_TURN_ON_OFF_LISTENER)
-        turn_on_off_listener.remove_listener()
-        turn_on_off_listener.remove_listener2()
+        turn_on_off_listener = data.pop(ATTR_TURN_ON_OFF_LISTENER, None)
+        if turn_on_off_listener is not None:
+            turn_on_off_listener.remove_listeners()
+        data.pop(ATTR_EPHEMERIS_CACHE, None)
+        data.pop(ATTR_COMMAND_SCHEDULER, None)
+        data.pop(ATTR_LIGHT_PROFILES, None)
+        light_groups = data.pop(ATTR_LIGHT_GROUPS, None)
+        if light_groups is not None:
+            light_groups.remove_listener()
 
     if not data:
         hass.data.pop(DOMAIN)
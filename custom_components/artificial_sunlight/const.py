@@ -41,6 +41,7 @@ CONF_DETECT_NON_HA_CHANGES, DEFAULT_DETECT_NON_HA_CHANGES = (
 CONF_INITIAL_TRANSITION, DEFAULT_INITIAL_TRANSITION = "initial_transition", 0
 CONF_SLEEP_TRANSITION, DEFAULT_SLEEP_TRANSITION = "sleep_transition", 1
 CONF_INTERVAL, DEFAULT_INTERVAL = "interval", 90
+CONF_SCHEDULE_NEXT_CHANGE, DEFAULT_SCHEDULE_NEXT_CHANGE = "schedule_next_change", False
 CONF_MAX_BRIGHTNESS, DEFAULT_MAX_BRIGHTNESS = "max_brightness", 100
 CONF_MAX_COLOR_TEMP, DEFAULT_MAX_COLOR_TEMP = "max_color_temp", 8000
 CONF_MIN_BRIGHTNESS, DEFAULT_MIN_BRIGHTNESS = "min_brightness", 1
@@ -59,6 +60,28 @@ CONF_SUNSET_OFFSET, DEFAULT_SUNSET_OFFSET = "sunset_offset", 0
 CONF_SUNSET_TIME = "sunset_time"
 CONF_TAKE_OVER_CONTROL, DEFAULT_TAKE_OVER_CONTROL = "take_over_control", True
 CONF_TRANSITION, DEFAULT_TRANSITION = "transition", 45
+CONF_ADAPT_CONCURRENCY, DEFAULT_ADAPT_CONCURRENCY = "adapt_concurrency", 10
+CONF_BATCH_TURN_ON_COMMANDS, DEFAULT_BATCH_TURN_ON_COMMANDS = (
+    "batch_turn_on_commands",
+    False,
+)
+CONF_SKIP_UNCHANGED_COMMANDS, DEFAULT_SKIP_UNCHANGED_COMMANDS = (
+    "skip_unchanged_commands",
+    False,
+)
+CONF_MAX_COMMANDS_PER_SECOND, DEFAULT_MAX_COMMANDS_PER_SECOND = (
+    "max_commands_per_second",
+    0,
+)
+CONF_COMMAND_BURST, DEFAULT_COMMAND_BURST = "command_burst", 5
+CONF_RATE_LIMIT_PER_PLATFORM, DEFAULT_RATE_LIMIT_PER_PLATFORM = (
+    "rate_limit_per_platform",
+    False,
+)
+CONF_PRIORITY, DEFAULT_PRIORITY = "priority", 0
+CONF_MAX_STATE_AGE, DEFAULT_MAX_STATE_AGE = "max_state_age", 0
+CONF_POLL_BUDGET, DEFAULT_POLL_BUDGET = "poll_budget", 0
+CONF_DIAGNOSTIC_SENSORS, DEFAULT_DIAGNOSTIC_SENSORS = "diagnostic_sensors", False
 
 ######### BEGIN Natural change addition #########
 
@@ -80,7 +103,7 @@ CONF_BLUEHOUR_CT, DEFAULT_BLUEHOUR_CT = "bluehour_color_temp", 20000  #
 # Defines Blue color as night light
 
 CONF_USE_NIGHT_COLOR_RGB, DEFAULT_USE_NIGHT_COLOR_RGB = "use_night_color_rgb", False
-CONF_NIGHT_COLOR, DEFAULT_NIGHT_COLOR = "night_color", [0, 0, 255]
+CONF_NIGHT_COLOR, DEFAULT_NIGHT_COLOR = "night_color", "[0, 0, 255]"
 CONF_EXTEND_CCT_RGB_COLOR, DEFAULT_EXTEND_CCT_RGB_COLOR = "extend_cct_rgb_color", False
 
 ######### Natural change addition END #########
@@ -89,6 +112,10 @@ SLEEP_MODE_SWITCH = "sleep_mode_switch"
 ADAPT_COLOR_SWITCH = "adapt_color_switch"
 ADAPT_BRIGHTNESS_SWITCH = "adapt_brightness_switch"
 ATTR_TURN_ON_OFF_LISTENER = "turn_on_off_listener"
+ATTR_EPHEMERIS_CACHE = "ephemeris_cache"
+ATTR_COMMAND_SCHEDULER = "command_scheduler"
+ATTR_LIGHT_PROFILES = "light_profiles"
+ATTR_LIGHT_GROUPS = "light_groups"
 UNDO_UPDATE_LISTENER = "undo_update_listener"
 NONE_STR = "None"
 ATTR_ADAPT_COLOR = "adapt_color"
@@ -98,6 +125,8 @@ SERVICE_SET_MANUAL_CONTROL = "set_manual_control"
 CONF_MANUAL_CONTROL = "manual_control"
 SERVICE_APPLY = "apply"
 CONF_TURN_ON_LIGHTS = "turn_on_lights"
+SERVICE_PROFILE = "profile"
+CONF_DURATION, DEFAULT_PROFILE_DURATION = "duration", 60
 
 TURNING_OFF_DELAY = 5
 
@@ -114,6 +143,7 @@ VALIDATION_TUPLES = [
     (CONF_SLEEP_TRANSITION, DEFAULT_SLEEP_TRANSITION, VALID_TRANSITION),
     (CONF_TRANSITION, DEFAULT_TRANSITION, VALID_TRANSITION),
     (CONF_INTERVAL, DEFAULT_INTERVAL, cv.positive_int),
+    (CONF_SCHEDULE_NEXT_CHANGE, DEFAULT_SCHEDULE_NEXT_CHANGE, bool),
     (CONF_MIN_BRIGHTNESS, DEFAULT_MIN_BRIGHTNESS, int_between(1, 100)),
     (CONF_MAX_BRIGHTNESS, DEFAULT_MAX_BRIGHTNESS, int_between(1, 100)),
     (CONF_MIN_COLOR_TEMP, DEFAULT_MIN_COLOR_TEMP, int_between(1000, 10000)),
@@ -128,6 +158,20 @@ VALIDATION_TUPLES = [
     (CONF_TAKE_OVER_CONTROL, DEFAULT_TAKE_OVER_CONTROL, bool),
     (CONF_DETECT_NON_HA_CHANGES, DEFAULT_DETECT_NON_HA_CHANGES, bool),
     (CONF_SEPARATE_TURN_ON_COMMANDS, DEFAULT_SEPARATE_TURN_ON_COMMANDS, bool),
+    (CONF_ADAPT_CONCURRENCY, DEFAULT_ADAPT_CONCURRENCY, int_between(1, 100)),
+    (CONF_BATCH_TURN_ON_COMMANDS, DEFAULT_BATCH_TURN_ON_COMMANDS, bool),
+    (CONF_SKIP_UNCHANGED_COMMANDS, DEFAULT_SKIP_UNCHANGED_COMMANDS, bool),
+    (
+        CONF_MAX_COMMANDS_PER_SECOND,
+        DEFAULT_MAX_COMMANDS_PER_SECOND,
+        vol.All(vol.Coerce(float), vol.Range(min=0)),
+    ),
+    (CONF_COMMAND_BURST, DEFAULT_COMMAND_BURST, int_between(1, 100)),
+    (CONF_RATE_LIMIT_PER_PLATFORM, DEFAULT_RATE_LIMIT_PER_PLATFORM, bool),
+    (CONF_PRIORITY, DEFAULT_PRIORITY, int_between(0, 100)),
+    (CONF_MAX_STATE_AGE, DEFAULT_MAX_STATE_AGE, cv.positive_int),
+    (CONF_POLL_BUDGET, DEFAULT_POLL_BUDGET, cv.positive_int),
+    (CONF_DIAGNOSTIC_SENSORS, DEFAULT_DIAGNOSTIC_SENSORS, bool),
     ######### BEGIN Natural change addition #########
     (CONF_NIGHT_COLOR, DEFAULT_NIGHT_COLOR, str),
     (CONF_LANDSCAPE_HORIZON, DEFAULT_LANDSCAPE_HORIZON, int),
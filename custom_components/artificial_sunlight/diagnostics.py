@@ -0,0 +1,52 @@
+"""Diagnostics for the Artificial Sunlight integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    ATTR_COMMAND_SCHEDULER,
+    ATTR_EPHEMERIS_CACHE,
+    ATTR_LIGHT_GROUPS,
+    ATTR_LIGHT_PROFILES,
+    ATTR_TURN_ON_OFF_LISTENER,
+    DOMAIN,
+)
+
+# Objects in `hass.data[DOMAIN]` that are shared by all profiles
+_SHARED_OBJECTS = (
+    ATTR_TURN_ON_OFF_LISTENER,
+    ATTR_EPHEMERIS_CACHE,
+    ATTR_LIGHT_PROFILES,
+    ATTR_LIGHT_GROUPS,
+    ATTR_COMMAND_SCHEDULER,
+)
+
+
+def _with_hit_rate(stats: dict[str, Any]) -> dict[str, Any]:
+    """Add the 'hit_rate' to the statistics of a cache."""
+    if "hits" in stats:
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else None
+    return stats
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the internal state of a profile and the shared caches."""
+    data = hass.data.get(DOMAIN, {})
+    switch = data.get(config_entry.entry_id, {}).get(SWITCH_DOMAIN)
+    return {
+        "data": dict(config_entry.data),
+        "options": dict(config_entry.options),
+        "switch": None if switch is None else switch.as_dict(),
+        "shared": {
+            key: _with_hit_rate(data[key].as_dict())
+            for key in _SHARED_OBJECTS
+            if key in data
+        },
+    }
@@ -0,0 +1,68 @@
+"""On-demand profiling for the Artificial Sunlight integration."""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import logging
+import pstats
+import time
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import CONF_DURATION, DEFAULT_PROFILE_DURATION, DOMAIN, SERVICE_PROFILE
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        )
+    }
+)
+
+# The summary only lists the functions of this integration
+_SUMMARY_RESTRICTION = DOMAIN
+_SUMMARY_LINES = 50
+
+
+def _write_profile(profiler: cProfile.Profile, path: str) -> None:
+    """Write the pstats file and a text summary (blocking)."""
+    profiler.dump_stats(f"{path}.prof")
+    with open(f"{path}.txt", "w", encoding="utf-8") as file:
+        stats = pstats.Stats(profiler, stream=file)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        stats.print_stats(_SUMMARY_RESTRICTION, _SUMMARY_LINES)
+
+
+@callback
+def async_register_profile_service(hass: HomeAssistant) -> None:
+    """Register the 'profile' service of the integration."""
+    running: set[cProfile.Profile] = set()
+
+    async def handle_profile(service_call: ServiceCall) -> None:
+        """Profile the event loop for 'duration' seconds."""
+        if running:
+            raise HomeAssistantError("Artificial Sunlight is already profiling")
+        duration = service_call.data[CONF_DURATION]
+        path = hass.config.path(f"{DOMAIN}_profile_{int(time.time())}")
+        profiler = cProfile.Profile()
+        running.add(profiler)
+        _LOGGER.warning("Profiling for %s s, writing to %s.prof", duration, path)
+        # Everything that runs in the event loop is profiled, the summary
+        # shows the integration's part, e.g., 'get_settings' and '_adapt_lights'
+        profiler.enable()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profiler.disable()
+            running.discard(profiler)
+        await hass.async_add_executor_job(_write_profile, profiler, path)
+        _LOGGER.warning("Wrote the profile to %s.prof and %s.txt", path, path)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, handle_profile, schema=PROFILE_SCHEMA
+    )
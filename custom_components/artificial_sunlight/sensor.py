@@ -0,0 +1,131 @@
+"""Diagnostic sensors for the Artificial Sunlight integration."""
+from __future__ import annotations
+
+from datetime import timedelta
+import logging
+from typing import Any, Callable, NamedTuple, Optional
+
+from homeassistant.components.sensor import (
+    STATE_CLASS_MEASUREMENT,
+    STATE_CLASS_TOTAL_INCREASING,
+    SensorEntity,
+)
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import TIME_MILLISECONDS
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.util import slugify
+
+from .const import CONF_DIAGNOSTIC_SENSORS, CONF_NAME, DOMAIN
+from .switch import ArtifSunSwitch, validate
+
+_LOGGER = logging.getLogger(__name__)
+
+# The metrics are read from the switch, there is no need to update them often
+SCAN_INTERVAL = timedelta(seconds=60)
+
+
+class Metric(NamedTuple):
+    """A performance metric of an `ArtifSunSwitch`."""
+
+    name: str
+    icon: str
+    unit: Optional[str]
+    state_class: str
+    value: Callable[[ArtifSunSwitch], Any]
+
+
+METRICS = (
+    Metric(
+        "Pass Duration",
+        "mdi:timer-outline",
+        TIME_MILLISECONDS,
+        STATE_CLASS_MEASUREMENT,
+        lambda switch: switch.last_pass_duration,
+    ),
+    Metric(
+        "Commands Per Hour",
+        "mdi:send",
+        "commands/h",
+        STATE_CLASS_MEASUREMENT,
+        lambda switch: switch.commands_last_hour.total,
+    ),
+    Metric(
+        "Skipped Commands",
+        "mdi:send-lock",
+        None,
+        STATE_CLASS_TOTAL_INCREASING,
+        lambda switch: switch.counters["skipped_commands"],
+    ),
+    Metric(
+        "Manual Control Skips",
+        "mdi:hand-back-right",
+        None,
+        STATE_CLASS_TOTAL_INCREASING,
+        lambda switch: switch.counters["manual_control_skips"],
+    ),
+    Metric(
+        "Forced Polls",
+        "mdi:refresh",
+        None,
+        STATE_CLASS_TOTAL_INCREASING,
+        lambda switch: switch.counters["polled_lights"],
+    ),
+    Metric(
+        "Astral Computations",
+        "mdi:sun-clock",
+        None,
+        STATE_CLASS_TOTAL_INCREASING,
+        lambda switch: switch.astral_computations,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, config_entry: ConfigEntry, async_add_entities: bool
+):
+    """Set up the diagnostic sensors of an Artificial Sunlight profile."""
+    data = validate(config_entry)
+    if not data[CONF_DIAGNOSTIC_SENSORS]:
+        return
+    async_add_entities([MetricSensor(hass, config_entry, metric) for metric in METRICS])
+
+
+class MetricSensor(SensorEntity):
+    """A performance metric of an Artificial Sunlight switch."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self, hass: HomeAssistant, config_entry: ConfigEntry, metric: Metric
+    ) -> None:
+        """Initialize the sensor of 'metric'."""
+        self.hass = hass
+        self._entry_id = config_entry.entry_id
+        self._metric = metric
+        name = validate(config_entry)[CONF_NAME]
+        self._attr_name = f"Artificial Sunlight {metric.name}: {name}"
+        self._attr_unique_id = f"{name}_{slugify(metric.name)}"
+        self._attr_icon = metric.icon
+        self._attr_native_unit_of_measurement = metric.unit
+        self._attr_state_class = metric.state_class
+
+    @property
+    def _switch(self) -> Optional[ArtifSunSwitch]:
+        # The switch platform might not be set up yet
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self._entry_id, {})
+        return entry_data.get(SWITCH_DOMAIN)
+
+    @property
+    def available(self) -> bool:
+        """Return whether the switch of this sensor exists."""
+        return self._switch is not None
+
+    @property
+    def native_value(self) -> Any:
+        """Return the current value of the metric."""
+        switch = self._switch
+        if switch is None:
+            return None
+        return self._metric.value(switch)
@@ -0,0 +1,173 @@
+"""Simulate the light settings of an Artificial Sunlight profile offline.
+
+Drives `SunSettings.get_settings` with an injected clock, so one can see
+what a profile does on any date at any location without waiting for it:
+
+    python -m custom_components.artificial_sunlight.simulate \\
+        --latitude 60 --longitude 10.75 --time-zone Europe/Oslo \\
+        --start 2021-12-21 --end 2021-12-22 --option max_color_temp=5500
+
+The settings are streamed as CSV (default) or JSON lines and the number
+of evaluations per second is reported on stderr, so it doubles as a
+benchmark of the calculation engine.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime
+import json
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Iterator, Optional
+
+import astral
+import astral.location
+import yaml
+
+import homeassistant.util.dt as dt_util
+
+from .const import _DOMAIN_SCHEMA, CONF_NAME
+from .switch import EphemerisCache, SunSettings, create_sun_settings, validate
+
+_FIELDS = (
+    "time",
+    "brightness_pct",
+    "color_temp_kelvin",
+    "color_temp_mired",
+    "rgb_color",
+    "sun_position",
+    "night",
+)
+
+
+def _parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Simulate the light settings of an Artificial Sunlight profile."
+    )
+    parser.add_argument("--latitude", type=float, required=True)
+    parser.add_argument("--longitude", type=float, required=True)
+    parser.add_argument(
+        "--elevation", type=float, default=0, help="elevation of the observer in m"
+    )
+    parser.add_argument("--time-zone", default="UTC", help="e.g., 'Europe/Oslo'")
+    parser.add_argument(
+        "--start",
+        type=datetime.date.fromisoformat,
+        required=True,
+        help="first local date, 'YYYY-MM-DD'",
+    )
+    parser.add_argument(
+        "--end",
+        type=datetime.date.fromisoformat,
+        help="local date after the last simulated one, default: start + 1 day",
+    )
+    parser.add_argument(
+        "--step", type=float, default=60, help="time between samples in seconds"
+    )
+    parser.add_argument(
+        "--profile", help="YAML/JSON file with the options of the profile"
+    )
+    parser.add_argument(
+        "--option",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="set a profile option, may be repeated",
+    )
+    parser.add_argument("--sleep", action="store_true", help="simulate sleep mode")
+    parser.add_argument("--format", choices=("csv", "json"), default="csv")
+    parser.add_argument("--output", default="-", help="output file, default: stdout")
+    return parser.parse_args(argv)
+
+
+def _load_options(args: argparse.Namespace) -> dict[str, Any]:
+    """Get the validated options of the profile from the command line."""
+    config: dict[str, Any] = {CONF_NAME: "simulation"}
+    if args.profile:
+        with open(args.profile, encoding="utf-8") as file:
+            config.update(yaml.safe_load(file) or {})
+    for option in args.option:
+        key, _, value = option.partition("=")
+        config[key] = yaml.safe_load(value)
+    # Validate like a YAML configured entry
+    return validate(SimpleNamespace(data=_DOMAIN_SCHEMA(config), options={}))
+
+
+def create_profile(args: argparse.Namespace) -> SunSettings:
+    """Create the `SunSettings` of the profile at the location in 'args'."""
+    time_zone = dt_util.get_time_zone(args.time_zone)
+    dt_util.set_default_time_zone(time_zone)
+    location = astral.location.Location(
+        astral.LocationInfo(
+            "simulation", "", args.time_zone, args.latitude, args.longitude
+        )
+    )
+    return create_sun_settings(
+        _load_options(args),
+        location,
+        args.elevation,
+        time_zone,
+        ephemeris=EphemerisCache(),
+    )
+
+
+def simulate(
+    profile: SunSettings,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    step: datetime.timedelta,
+    is_sleep: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Yield the settings of 'profile' from 'start' until 'end' every 'step'."""
+    now = start
+    while now < end:
+        settings = profile.get_settings(is_sleep, 0, now=now)
+        settings["time"] = dt_util.as_local(now).isoformat()
+        yield settings
+        now += step
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the simulation from the command line."""
+    args = _parse_args(argv)
+    profile = create_profile(args)
+    end_date = args.end or args.start + datetime.timedelta(days=1)
+    samples = simulate(
+        profile,
+        dt_util.start_of_local_day(args.start),
+        dt_util.start_of_local_day(end_date),
+        datetime.timedelta(seconds=args.step),
+        args.sleep,
+    )
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    n_samples = 0
+    t_start = time.perf_counter()
+    try:
+        if args.format == "csv":
+            writer = csv.DictWriter(output, _FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for settings in samples:
+                writer.writerow(settings)
+                n_samples += 1
+        else:
+            for settings in samples:
+                output.write(json.dumps({key: settings[key] for key in _FIELDS}))
+                output.write("\n")
+                n_samples += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    duration = time.perf_counter() - t_start
+    print(
+        f"{n_samples} evaluations in {duration:.3f} s"
+        f" ({n_samples / max(duration, 1e-9):.0f} evaluations/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
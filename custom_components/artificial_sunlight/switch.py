@@ -2,20 +2,24 @@
 """Switch for the Artificial Sunlight integration."""
 from __future__ import annotations
 
+import array
 import asyncio
 import bisect
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict, deque
 from copy import deepcopy
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import datetime
 from datetime import timedelta
 import functools
 import hashlib
 import logging
 import math
-from typing import Any, Optional, Union
+import time
+from typing import Any, Callable, Collection, NamedTuple, Optional, Sequence, Union
 
 import astral
+import astral.location
+import astral.sun
 import pytz
 
 # from astral import SunDirection
@@ -23,6 +27,11 @@ import pytz
 # from astral.sun import SunDirection, Depression
 import voluptuous as vol
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, see `evaluate`
+    np = None
+
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
     ATTR_BRIGHTNESS_PCT,
@@ -71,6 +80,7 @@ from homeassistant.const import (
     STATE_ON,
 )
 from homeassistant.core import (
+    CALLBACK_TYPE,
     Context,
     Event,
     HomeAssistant,
@@ -78,9 +88,11 @@ from homeassistant.core import (
     State,
     callback,
 )
-from homeassistant.helpers import entity_platform
+from homeassistant.helpers import entity_platform, entity_registry
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_utc_time,
     async_track_state_change_event,
     async_track_time_interval,
 )
@@ -100,7 +112,14 @@ from .const import (
     ADAPT_COLOR_SWITCH,
     ATTR_ADAPT_BRIGHTNESS,
     ATTR_ADAPT_COLOR,
+    ATTR_COMMAND_SCHEDULER,
+    ATTR_EPHEMERIS_CACHE,
+    ATTR_LIGHT_GROUPS,
+    ATTR_LIGHT_PROFILES,
     ATTR_TURN_ON_OFF_LISTENER,
+    CONF_ADAPT_CONCURRENCY,
+    CONF_BATCH_TURN_ON_COMMANDS,
+    CONF_COMMAND_BURST,
     CONF_DETECT_NON_HA_CHANGES,
     CONF_INITIAL_TRANSITION,
     CONF_SLEEP_TRANSITION,
@@ -109,11 +128,18 @@ from .const import (
     CONF_MANUAL_CONTROL,
     CONF_MAX_BRIGHTNESS,
     CONF_MAX_COLOR_TEMP,
+    CONF_MAX_COMMANDS_PER_SECOND,
     CONF_MIN_BRIGHTNESS,
     CONF_MIN_COLOR_TEMP,
     CONF_ONLY_ONCE,
     CONF_PREFER_RGB_COLOR,
+    CONF_MAX_STATE_AGE,
+    CONF_POLL_BUDGET,
+    CONF_PRIORITY,
+    CONF_RATE_LIMIT_PER_PLATFORM,
+    CONF_SCHEDULE_NEXT_CHANGE,
     CONF_SEPARATE_TURN_ON_COMMANDS,
+    CONF_SKIP_UNCHANGED_COMMANDS,
     CONF_SLEEP_BRIGHTNESS,
     CONF_SLEEP_COLOR_TEMP,
     CONF_SUNRISE_OFFSET,
@@ -158,6 +184,14 @@ from .const import (
     ######### Natural change addition #########
 )
 
+# The attributes a `LightProfile` is compiled from
+_PROFILE_ATTRS = (
+    ATTR_SUPPORTED_FEATURES,
+    ATTR_SUPPORTED_COLOR_MODES,
+    "min_mireds",
+    "max_mireds",
+)
+
 _SUPPORT_OPTS = {
     "brightness": SUPPORT_BRIGHTNESS,
     "white_value": SUPPORT_WHITE_VALUE,
@@ -197,6 +231,14 @@ _ALLOWED_ORDERS_CT = {_ORDER_CT[i:] + _ORDER_CT[:i] for i in range(len(_ORDER_CT
 
 _LOGGER = logging.getLogger(__name__)
 
+# Number of dates for which `SunSettings` keeps the sun events in memory
+_DAY_EVENTS_CACHE_SIZE = 4
+# Time between two samples of the precomputed lighting curve of a day
+_CURVE_RESOLUTION = timedelta(minutes=1)
+# Bounds of the time between two updates with 'schedule_next_change'
+_MIN_NEXT_CHANGE_DELAY = timedelta(seconds=5)
+_MAX_NEXT_CHANGE_DELAY = timedelta(minutes=30)
+
 # SCAN_INTERVAL = timedelta(seconds=10)  # HA Polling Data from HA API Intervall, seems to be not needed in that INtegration
 
 # Thresholds f or checking if there was a manual light change outside this integration. Consider it a significant change when attribute changes more than
@@ -204,6 +246,18 @@ BRIGHTNESS_CHANGE = 25  # ≈10% of total range
 COLOR_TEMP_CHANGE = 20  # ≈5% of total range
 RGB_REDMEAN_CHANGE = 80  # ≈10% of total range
 
+# Deadband of the adaptation: with 'skip_unchanged_commands', do not send a new
+# 'light.turn_on' when no attribute changes more than this since the last one.
+BRIGHTNESS_DEADBAND = 2  # ≈1% of total range, a barely visible step
+COLOR_TEMP_DEADBAND = 5  # ≈ the just noticeable difference in mired
+RGB_REDMEAN_DEADBAND = 8  # ≈1% of total range
+
+# The number of 'state_changed' events of a single 'light.turn_on' call that are
+# kept to compare the state of the light to, see `TurnOnOffListener`
+MAX_STATE_CHANGES = 8
+# The number of adaptation decisions that are kept per light, see `TraceEntry`
+TRACE_SIZE = 16
+
 COLOR_ATTRS = {  # Should ATTR_PROFILE be in here?
     ATTR_COLOR_NAME,
     ATTR_COLOR_TEMP,
@@ -223,6 +277,14 @@ BRIGHTNESS_ATTRS = {
 
 # Keep a short domain version for the context instances (which can only be 36 chars)
 _DOMAIN_SHORT = "artif_lght"
+# The number of recently created contexts that can be attributed to their switch
+CONTEXT_REGISTRY_SIZE = 1024
+
+# Debug messages of the hot paths are logged at most once per this many seconds
+# per message key, see `SampledLog`
+LOG_SAMPLE_INTERVAL = 60
+# Seconds between the periodic summaries of the counters of a switch
+LOG_SUMMARY_INTERVAL = 3600
 
 # TODO Reorganize vars to a more hierachy style prefixes like: "ct_abcd", "illum_abcd"
 
@@ -245,6 +307,106 @@ def create_context(
     )
 
 
+class HourlyCount:
+    """Count the events of the last hour in one-minute buckets."""
+
+    __slots__ = ("_buckets", "_minute")
+
+    def __init__(self) -> None:
+        """Initialize a count of zero."""
+        self._buckets = [0] * 60
+        self._minute: Optional[int] = None
+
+    def add(self, number: int = 1) -> None:
+        """Count 'number' events now."""
+        minute = self._advance()
+        self._buckets[minute % 60] += number
+
+    @property
+    def total(self) -> int:
+        """Return the number of events in the last hour."""
+        self._advance()
+        return sum(self._buckets)
+
+    def _advance(self) -> int:
+        """Clear the buckets of the minutes that passed since the last call."""
+        minute = int(time.monotonic() // 60)
+        if self._minute is not None:
+            for passed in range(self._minute + 1, min(minute, self._minute + 60) + 1):
+                self._buckets[passed % 60] = 0
+        self._minute = minute
+        return minute
+
+
+class SampledLog:
+    """Rate limit the debug messages of a hot path, per message key.
+
+    Check `sample` before logging, so nothing is formatted when the message
+    is dropped or the level is disabled.
+    """
+
+    __slots__ = ("_last", "suppressed")
+
+    def __init__(self) -> None:
+        """Initialize without logged messages."""
+        self._last: dict[str, float] = {}
+        self.suppressed = 0
+
+    def sample(self, key: str, level: int = logging.DEBUG) -> bool:
+        """Return whether the message 'key' should be logged at 'level' now."""
+        if not _LOGGER.isEnabledFor(level):
+            return False
+        now = time.monotonic()
+        last = self._last.get(key)
+        if last is not None and now - last < LOG_SAMPLE_INTERVAL:
+            self.suppressed += 1
+            return False
+        self._last[key] = now
+        return True
+
+    def forget(self, key: str) -> None:
+        """Forget when the message 'key' was logged, e.g., of a removed light."""
+        self._last.pop(key, None)
+
+
+class ContextFactory:
+    """Create the contexts of a switch, like `create_context` does.
+
+    The hashed name is computed once. Every created context is registered
+    with its switch and reason (e.g., 'interval') in 'registry', which is
+    shared by all switches and only keeps the last CONTEXT_REGISTRY_SIZE.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        switch: ArtifSunSwitch,
+        registry: OrderedDict[str, tuple[ArtifSunSwitch, str]],
+    ) -> None:
+        """Initialize the ContextFactory of 'switch'."""
+        self.prefix = f"{_DOMAIN_SHORT}_{_short_hash(name)}_"
+        self.switch = switch
+        self.registry = registry
+        # To count the number of `Context` instances
+        self.count = 0
+
+    def create(self, which: str, parent: Optional[Context] = None) -> Context:
+        """Create a context for the 'which' pass of the switch."""
+        parent_id = parent.id if parent else None
+        context = Context(id=f"{self.prefix}{which}_{self.count}", parent_id=parent_id)
+        self.count += 1
+        self.registry[context.id] = (self.switch, which)
+        if len(self.registry) > CONTEXT_REGISTRY_SIZE:
+            self.registry.popitem(last=False)
+        return context
+
+    def unregister(self) -> None:
+        """Remove the contexts of the switch from 'registry', e.g., when removed."""
+        for context_id, (switch, _) in list(self.registry.items()):
+            if switch is self.switch:
+                del self.registry[context_id]
+
+
 def is_our_context(context: Optional[Context]) -> bool:
     """Check whether this integration created 'context'."""
     if context is None:
@@ -272,32 +434,84 @@ def _split_service_data(service_data, adapt_brightness, adapt_color):
     return service_datas
 
 
+def _within_deadband(
+    last_service_data: dict[str, Any], service_data: dict[str, Any]
+) -> bool:
+    """Whether 'service_data' would not visibly change the last sent target."""
+    # The last one could have been sent in a batch with other lights
+    ignored = {ATTR_ENTITY_ID, ATTR_TRANSITION}
+    if last_service_data.keys() - ignored != service_data.keys() - ignored:
+        return False
+    for attr, value in service_data.items():
+        last_value = last_service_data.get(attr)
+        if attr in (ATTR_BRIGHTNESS, ATTR_WHITE_VALUE):
+            if abs(value - last_value) > BRIGHTNESS_DEADBAND:
+                return False
+        elif attr == ATTR_COLOR_TEMP:
+            if abs(value - last_value) > COLOR_TEMP_DEADBAND:
+                return False
+        elif attr == ATTR_RGB_COLOR:
+            if color_difference_redmean(value, last_value) > RGB_REDMEAN_DEADBAND:
+                return False
+        elif attr not in ignored and value != last_value:
+            return False
+    return True
+
+
+def _batch_service_data(
+    service_datas: list[Optional[dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    """Merge the service_datas that only differ in their 'entity_id'."""
+    batches: dict[tuple, dict[str, Any]] = {}
+    for service_data in service_datas:
+        if service_data is None:
+            continue
+        key = tuple(
+            (attr, tuple(value) if isinstance(value, list) else value)
+            for attr, value in sorted(service_data.items())
+            if attr != ATTR_ENTITY_ID
+        )
+        batch = batches.get(key)
+        if batch is None:
+            batches[key] = {
+                **service_data,
+                ATTR_ENTITY_ID: [service_data[ATTR_ENTITY_ID]],
+            }
+        else:
+            batch[ATTR_ENTITY_ID].append(service_data[ATTR_ENTITY_ID])
+    return list(batches.values())
+
+
 async def handle_apply(switch: ArtifSunSwitch, service_call: ServiceCall):
     """Handle the entity service apply."""
     hass = switch.hass
     data = service_call.data
     all_lights = data[CONF_LIGHTS]
     if not all_lights:
-        all_lights = switch._lights  # pylint: disable=protected-access
+        all_lights = switch._configured_lights  # pylint: disable=protected-access
     all_lights = _expand_light_groups(hass, all_lights)
-    switch.turn_on_off_listener.lights.update(all_lights)
     _LOGGER.debug(
         "Called 'artificial_sunlight.apply' service with '%s'",
         data,
     )
-    for light in all_lights:
-        if data[CONF_TURN_ON_LIGHTS] or is_on(hass, light):
-            # COMMENT service call: Executing time independend coroutines for adapting a single entity
-            await switch._adapt_light(  # pylint: disable=protected-access
-                light,
-                data[CONF_TRANSITION],
-                data[ATTR_ADAPT_BRIGHTNESS],
-                data[ATTR_ADAPT_COLOR],
-                data[CONF_PREFER_RGB_COLOR],
-                data[CONF_EXTEND_CCT_RGB_COLOR],
-                force=True,
-                context=switch.create_context("service", parent=service_call.context),
-            )
+    lights = [
+        light for light in all_lights if data[CONF_TURN_ON_LIGHTS] or is_on(hass, light)
+    ]
+    # COMMENT service call: Executing time independend coroutines for adapting the entities
+    try:
+        await switch._adapt_lights_concurrently(  # pylint: disable=protected-access
+            lights,
+            data[CONF_TRANSITION],
+            data[ATTR_ADAPT_BRIGHTNESS],
+            data[ATTR_ADAPT_COLOR],
+            data[CONF_PREFER_RGB_COLOR],
+            data[CONF_EXTEND_CCT_RGB_COLOR],
+            force=True,
+            context=switch.create_context("service", parent=service_call.context),
+        )
+    finally:
+        # Lights that are in no switch are not tracked after the service call
+        switch.turn_on_off_listener.discard_unowned(*all_lights)
 
 
 async def handle_set_manual_control(switch: ArtifSunSwitch, service_call: ServiceCall):
@@ -313,7 +527,14 @@ async def handle_set_manual_control(switch: ArtifSunSwitch, service_call: Servic
     )
     if service_call.data[CONF_MANUAL_CONTROL]:
         for light in all_lights:
-            switch.turn_on_off_listener.manual_control[light] = True
+            if light not in switch.turn_on_off_listener.owners:
+                _LOGGER.warning(
+                    "%s: Cannot set manual control of '%s', it is in no switch",
+                    switch.name,
+                    light,
+                )
+                continue
+            switch.turn_on_off_listener.record(light).manual_control = True
             _fire_manual_control_event(switch, light, service_call.context)
     else:
         switch.turn_on_off_listener.reset(*all_lights)
@@ -360,6 +581,14 @@ async def async_setup_entry(
     if ATTR_TURN_ON_OFF_LISTENER not in data:
         data[ATTR_TURN_ON_OFF_LISTENER] = TurnOnOffListener(hass)
     turn_on_off_listener = data[ATTR_TURN_ON_OFF_LISTENER]
+    if ATTR_EPHEMERIS_CACHE not in data:
+        data[ATTR_EPHEMERIS_CACHE] = EphemerisCache()
+    if ATTR_COMMAND_SCHEDULER not in data:
+        data[ATTR_COMMAND_SCHEDULER] = CommandScheduler(hass)
+    if ATTR_LIGHT_PROFILES not in data:
+        data[ATTR_LIGHT_PROFILES] = LightProfileCache()
+    if ATTR_LIGHT_GROUPS not in data:
+        data[ATTR_LIGHT_GROUPS] = LightGroupIndex(hass)
     loc = get_astral_location(hass)
     sleep_mode_switch = SimpleSwitch("Sleep Mode", False, hass, config_entry)
     adapt_color_switch = SimpleSwitch("Adapt Color", True, hass, config_entry)
@@ -429,6 +658,43 @@ def validate(config_entry: ConfigEntry):
     return data
 
 
+def create_sun_settings(
+    data: dict[str, Any],
+    astral_location: astral.location.Location,
+    elevation_observer: float,
+    time_zone: Union[str, datetime.tzinfo],
+    **kwargs,
+) -> SunSettings:
+    """Create the `SunSettings` of the validated options 'data'."""
+    return SunSettings(
+        name=data[CONF_NAME],
+        astral_location=astral_location,
+        elevation_observer=elevation_observer,
+        max_brightness=data[CONF_MAX_BRIGHTNESS],
+        max_color_temp=data[CONF_MAX_COLOR_TEMP],
+        min_brightness=data[CONF_MIN_BRIGHTNESS],
+        min_color_temp=data[CONF_MIN_COLOR_TEMP],
+        sleep_brightness=data[CONF_SLEEP_BRIGHTNESS],
+        sleep_color_temp=data[CONF_SLEEP_COLOR_TEMP],
+        sunrise_offset=data[CONF_SUNRISE_OFFSET],
+        sunrise_time=data[CONF_SUNRISE_TIME],
+        sunset_offset=data[CONF_SUNSET_OFFSET],
+        sunset_time=data[CONF_SUNSET_TIME],
+        time_zone=time_zone,
+        transition=data[CONF_TRANSITION],
+        depression=data[CONF_TWILIGHT_STAGE],
+        horizon=data[CONF_LANDSCAPE_HORIZON],
+        dawn_ct=data[CONF_DAWN_COLOR_TEMP],
+        dusk_ct=data[CONF_DUSK_COLOR_TEMP],
+        sunrise_ct=data[CONF_SUNRISE_COLOR_TEMP],
+        sunset_ct=data[CONF_SUNSET_COLOR_TEMP],
+        bl_hr_ct=data[CONF_BLUEHOUR_CT],
+        use_night_color=data[CONF_USE_NIGHT_COLOR_RGB],
+        night_col=data[CONF_NIGHT_COLOR],
+        **kwargs,
+    )
+
+
 def match_switch_state_event(event: Event, from_or_to_state: list[str]):
     """Match state event when either 'from_state' or 'to_state' matches."""
     old_state = event.data.get("old_state")
@@ -442,30 +708,224 @@ def match_switch_state_event(event: Event, from_or_to_state: list[str]):
 
 
 def _expand_light_groups(hass: HomeAssistant, lights: list[str]) -> list[str]:
-    all_lights = set()
+    groups = hass.data[DOMAIN][ATTR_LIGHT_GROUPS]
+    all_lights = groups.expand(lights)
+    # The groups themselves are not adapted, only their (nested) members
     turn_on_off_listener = hass.data[DOMAIN][ATTR_TURN_ON_OFF_LISTENER]
-    for light in lights:
-        state = hass.states.get(light)
-        if state is None:
-            _LOGGER.debug("State of %s is None", light)
-            all_lights.add(light)
-        elif "entity_id" in state.attributes:  # it's a light group
-            group = state.attributes["entity_id"]
-            turn_on_off_listener.lights.discard(light)
-            all_lights.update(group)
-            _LOGGER.debug("Expanded %s to %s", light, group)
+    turn_on_off_listener.discard_lights(*set(lights).difference(all_lights))
+    return all_lights
+
+
+def _group_members(entity_ids: Union[str, Sequence[str]]) -> tuple[str, ...]:
+    """Get the 'entity_id' attribute of a group, a list or tuple, as a tuple."""
+    return (entity_ids,) if isinstance(entity_ids, str) else tuple(entity_ids)
+
+
+class LightGroupIndex:
+    """Index from (nested) light groups to the lights they contain.
+
+    Shared among all switches. Groups are resolved recursively on first use
+    and the result is kept until the 'entity_id' attribute of the group, or of
+    one of the groups nested in it, changes.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the LightGroupIndex that is shared among all switches."""
+        self.hass = hass
+        # Direct members of the groups, e.g., {"light.group": ("light.a", ...)}
+        self._members: dict[str, tuple[str, ...]] = {}
+        # Groups that directly contain an entity
+        self._parents: dict[str, set[str]] = defaultdict(set)
+        # All lights in a group, resolved recursively
+        self._leaves: dict[str, tuple[str, ...]] = {}
+        # Entities without a state yet, these might turn out to be groups
+        self._missing: set[str] = set()
+        self._listeners: list[Callable[[set[str]], None]] = []
+
+        self.remove_listener = self.hass.bus.async_listen(
+            EVENT_STATE_CHANGED, self._state_changed, event_filter=self._is_tracked
+        )
+
+    def expand(self, entity_ids: Sequence[str]) -> list[str]:
+        """Replace the groups in 'entity_ids' by the lights they contain."""
+        lights: dict[str, None] = {}  # insertion ordered set
+        for entity_id in entity_ids:
+            lights.update(dict.fromkeys(self._resolve(entity_id, set())))
+        return list(lights)
+
+    @callback
+    def async_add_listener(self, listener: Callable[[set[str]], None]) -> CALLBACK_TYPE:
+        """Call 'listener' with the affected entities when a group changes."""
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(listener)
+
+        return remove_listener
+
+    def _resolve(self, entity_id: str, visiting: set[str]) -> tuple[str, ...]:
+        leaves = self._leaves.get(entity_id)
+        if leaves is not None:
+            return leaves
+        members = self._members.get(entity_id)
+        if members is None:
+            state = self.hass.states.get(entity_id)
+            if state is None:
+                _LOGGER.debug("State of %s is None", entity_id)
+                self._missing.add(entity_id)
+                return (entity_id,)
+            self._missing.discard(entity_id)
+            if ATTR_ENTITY_ID not in state.attributes:  # it's a light
+                return (entity_id,)
+            members = self._set_members(entity_id, state.attributes[ATTR_ENTITY_ID])
+        if entity_id in visiting:
+            _LOGGER.warning("Light group %s contains itself, ignoring it", entity_id)
+            return ()
+        visiting.add(entity_id)
+        all_lights: dict[str, None] = {}
+        for member in members:
+            all_lights.update(dict.fromkeys(self._resolve(member, visiting)))
+        visiting.discard(entity_id)
+        leaves = self._leaves[entity_id] = tuple(all_lights)
+        _LOGGER.debug("Expanded %s to %s", entity_id, leaves)
+        return leaves
+
+    def _set_members(self, group: str, members: Any) -> tuple[str, ...]:
+        members = _group_members(members)
+        for member in self._members.get(group, ()):
+            self._parents[member].discard(group)
+        for member in members:
+            self._parents[member].add(group)
+        self._members[group] = members
+        return members
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the sizes of the index."""
+        return {
+            "groups": len(self._members),
+            "resolved_groups": len(self._leaves),
+            "missing_entities": len(self._missing),
+            "listeners": len(self._listeners),
+        }
+
+    def _remove_group(self, group: str) -> None:
+        for member in self._members.pop(group, ()):
+            self._parents[member].discard(group)
+
+    def _invalidate(self, entity_id: str) -> set[str]:
+        """Forget the resolved groups that contain 'entity_id'."""
+        affected = set()
+        todo = [entity_id]
+        while todo:
+            entity_id = todo.pop()
+            if entity_id in affected:
+                continue
+            affected.add(entity_id)
+            self._leaves.pop(entity_id, None)
+            todo.extend(self._parents.get(entity_id, ()))
+        return affected
+
+    @callback
+    def _is_tracked(self, event: Event) -> bool:
+        entity_id = event.data.get(ATTR_ENTITY_ID)
+        return entity_id in self._members or entity_id in self._missing
+
+    @callback
+    def _state_changed(self, event: Event) -> None:
+        entity_id = event.data[ATTR_ENTITY_ID]
+        new_state = event.data.get("new_state")
+        if new_state is None:  # removed, resolve again when it is back
+            self._remove_group(entity_id)
+            self._missing.add(entity_id)
+        elif ATTR_ENTITY_ID in new_state.attributes:
+            self._missing.discard(entity_id)
+            members = _group_members(new_state.attributes[ATTR_ENTITY_ID])
+            if members == self._members.get(entity_id):
+                return  # only the state of the group changed
+            self._set_members(entity_id, members)
         else:
-            all_lights.add(light)
-    return list(all_lights)
+            self._missing.discard(entity_id)
+            self._remove_group(entity_id)
+        affected = self._invalidate(entity_id)
+        _LOGGER.debug("Members of %s changed, affects %s", entity_id, affected)
+        for listener in list(self._listeners):
+            listener(affected)
+
+
+class LightProfile(NamedTuple):
+    """The capabilities of a light that determine its 'light.turn_on' calls.
+
+    Compiled from the state attributes by `LightProfileCache.get`.
+    """
+
+    features: frozenset[str]
+    min_mireds: Optional[int]
+    max_mireds: Optional[int]
+    # Which path of `ArtifSunSwitch._prepare_service_data` sets the color
+    rgb_only: bool
+    color_temp_only: bool
+    color_temp_and_rgb: bool
+
+
+class LightProfileCache:
+    """Cache of the compiled `LightProfile` of each light, shared by all switches.
+
+    A profile is only compiled again when the 'supported_features',
+    'supported_color_modes', 'min_mireds' or 'max_mireds' of the light change.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the LightProfileCache."""
+        # light: (attributes it was compiled from, signature, profile)
+        self._profiles: dict[str, tuple[Any, tuple, LightProfile]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, light: str, attributes: dict[str, Any]) -> LightProfile:
+        """Get the profile of 'light' with the state 'attributes'."""
+        cached = self._profiles.get(light)
+        if cached is not None and cached[0] is attributes:
+            self.hits += 1
+            return cached[2]
+        signature = tuple(attributes.get(attr) for attr in _PROFILE_ATTRS)
+        if cached is not None and cached[1] == signature:
+            self.hits += 1
+            self._profiles[light] = (attributes, signature, cached[2])
+            return cached[2]
+        self.misses += 1
+        profile = _compile_light_profile(attributes)
+        self._profiles[light] = (attributes, signature, profile)
+        return profile
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the size and the hit/miss counters of the cache."""
+        return {
+            "size": len(self._profiles),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def _light_profile(hass: HomeAssistant, light: str) -> LightProfile:
+    """Get the (cached) `LightProfile` of 'light'."""
+    attributes = hass.states.get(light).attributes
+    cache = hass.data.get(DOMAIN, {}).get(ATTR_LIGHT_PROFILES)
+    if cache is None:
+        return _compile_light_profile(attributes)
+    return cache.get(light, attributes)
 
 
 def _supported_features(hass: HomeAssistant, light: str):
-    state = hass.states.get(light)
-    supported_features = state.attributes[ATTR_SUPPORTED_FEATURES]
+    return set(_light_profile(hass, light).features)
+
+
+def _compile_light_profile(attributes: dict[str, Any]) -> LightProfile:
+    supported_features = attributes[ATTR_SUPPORTED_FEATURES]
     supported = {
         key for key, value in _SUPPORT_OPTS.items() if supported_features & value
     }
-    supported_color_modes = state.attributes.get(ATTR_SUPPORTED_COLOR_MODES, set())
+    supported_color_modes = attributes.get(ATTR_SUPPORTED_COLOR_MODES, set())
     if COLOR_MODE_RGB in supported_color_modes:
         supported.add("color")
         # Adding brightness here, see
@@ -485,7 +945,14 @@ def _supported_features(hass: HomeAssistant, light: str):
         supported.add("brightness")  # see above url
     if COLOR_MODE_BRIGHTNESS in supported_color_modes:
         supported.add("brightness")
-    return supported
+    return LightProfile(
+        features=frozenset(supported),
+        min_mireds=attributes.get("min_mireds"),
+        max_mireds=attributes.get("max_mireds"),
+        rgb_only="color" in supported and "color_temp" not in supported,
+        color_temp_only="color_temp" in supported and "color" not in supported,
+        color_temp_and_rgb="color_temp" in supported and "color" in supported,
+    )
 
 
 def color_difference_redmean(
@@ -626,17 +1093,34 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
 
         data = validate(config_entry)
         self._name = data[CONF_NAME]
+        self._configured_lights = data[CONF_LIGHTS]
         self._lights = data[CONF_LIGHTS]
+        self._remove_light_tracker: Optional[CALLBACK_TYPE] = None
 
         self._detect_non_ha_changes = data[CONF_DETECT_NON_HA_CHANGES]
+        self._max_state_age = data[CONF_MAX_STATE_AGE]
+        self._poll_budget = data[CONF_POLL_BUDGET]
         self._initial_transition = data[CONF_INITIAL_TRANSITION]
         self._sleep_transition = data[CONF_SLEEP_TRANSITION]
         self._interval = data[CONF_INTERVAL]
+        self._schedule_next_change = data[CONF_SCHEDULE_NEXT_CHANGE]
         self._only_once = data[CONF_ONLY_ONCE]
         self._prefer_rgb_color = data[CONF_PREFER_RGB_COLOR]
         self._separate_turn_on_commands = data[CONF_SEPARATE_TURN_ON_COMMANDS]
         self._take_over_control = data[CONF_TAKE_OVER_CONTROL]
+        self.priority = data[CONF_PRIORITY]
         self._transition = data[CONF_TRANSITION]
+        self._adapt_concurrency = data[CONF_ADAPT_CONCURRENCY]
+        self._batch_turn_on_commands = data[CONF_BATCH_TURN_ON_COMMANDS]
+        self._skip_unchanged_commands = data[CONF_SKIP_UNCHANGED_COMMANDS]
+        self._command_limits = (
+            data[CONF_MAX_COMMANDS_PER_SECOND],
+            data[CONF_COMMAND_BURST],
+            data[CONF_RATE_LIMIT_PER_PLATFORM],
+        )
+        self._command_scheduler: CommandScheduler = hass.data[DOMAIN][
+            ATTR_COMMAND_SCHEDULER
+        ]
 
         self._use_night_color = data[CONF_USE_NIGHT_COLOR_RGB]
         self._extend_cct_rgb_color = data[CONF_EXTEND_CCT_RGB_COLOR]
@@ -652,45 +1136,38 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
         # tz = self.hass.config.time_zone
         # observer = astral.Observer(lat, lon, elev)
 
-        self._sun_light_settings = SunSettings(
-            name=self._name,
-            astral_location=a_location,
-            elevation_observer=obs_elevation,
-            max_brightness=data[CONF_MAX_BRIGHTNESS],
-            max_color_temp=data[CONF_MAX_COLOR_TEMP],
-            min_brightness=data[CONF_MIN_BRIGHTNESS],
-            min_color_temp=data[CONF_MIN_COLOR_TEMP],
-            sleep_brightness=data[CONF_SLEEP_BRIGHTNESS],
-            sleep_color_temp=data[CONF_SLEEP_COLOR_TEMP],
-            sunrise_offset=data[CONF_SUNRISE_OFFSET],
-            sunrise_time=data[CONF_SUNRISE_TIME],
-            sunset_offset=data[CONF_SUNSET_OFFSET],
-            sunset_time=data[CONF_SUNSET_TIME],
-            time_zone=self.hass.config.time_zone,
-            transition=data[CONF_TRANSITION],
-            depression=data[CONF_TWILIGHT_STAGE],
-            horizon=data[CONF_LANDSCAPE_HORIZON],
-            dawn_ct=data[CONF_DAWN_COLOR_TEMP],
-            dusk_ct=data[CONF_DUSK_COLOR_TEMP],
-            sunrise_ct=data[CONF_SUNRISE_COLOR_TEMP],
-            sunset_ct=data[CONF_SUNSET_COLOR_TEMP],
-            bl_hr_ct=data[CONF_BLUEHOUR_CT],
-            use_night_color=data[CONF_USE_NIGHT_COLOR_RGB],
-            night_col=data[CONF_NIGHT_COLOR],
+        self._sun_light_settings = create_sun_settings(
+            data,
+            a_location,
+            obs_elevation,
+            self.hass.config.time_zone,
+            ephemeris=hass.data[DOMAIN][ATTR_EPHEMERIS_CACHE],
         )
 
         # Set other attributes
         self._icon = ICON
         self._state = None
 
-        # Tracks 'off' → 'on' state changes
-        self._on_to_off_event: dict[str, Event] = {}
-        # Tracks 'on' → 'off' state changes
-        self._off_to_on_event: dict[str, Event] = {}
-        # Locks that prevent light adjusting when waiting for a light to 'turn_off'
+        # Limits the number of lights that are adapted at the same time
+        self._adapt_semaphore = asyncio.Semaphore(self._adapt_concurrency)
+        # Counts the sent and skipped (by the deadband) 'light.turn_on' commands,
+        # the lights skipped because of manual control and the polled lights
+        self.counters: Counter[str] = Counter()
+        self.commands_last_hour = HourlyCount()
+        # Duration of the last update pass in ms
+        self.last_pass_duration: Optional[float] = None
+        # Samples the debug messages of every pass, see `_log_summary`
+        self._log = SampledLog()
+        self._last_summary = time.monotonic()
+        # Cancels the timer of the next update with 'schedule_next_change'
+        self._remove_next_update: Optional[CALLBACK_TYPE] = None
+        # The timer of the pending second 'light.turn_on' of separate_turn_on_commands
+        # and the lights of its batch that it is still sent to
+        self._second_commands: dict[str, tuple[CALLBACK_TYPE, set[str]]] = {}
+        self._contexts = ContextFactory(self._name, self, turn_on_off_listener.contexts)
+        # Prevents adjusting a light while waiting for it to 'turn_off', per
+        # switch so that switches with the same light do not wait for each other
         self._locks: dict[str, asyncio.Lock] = {}
-        # To count the number of `Context` instances
-        self._context_cnt: int = 0
 
         # Set in self._update_attrs_and_maybe_adapt_lights
         self._settings: dict[str, Any] = {}
@@ -726,6 +1203,7 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
 
     async def async_added_to_hass(self) -> None:
         """Call when entity about to be added to hass."""
+        self._command_scheduler.set_limits(self._name, *self._command_limits)
         if self.hass.is_running:
             await self._setup_listeners()
         else:
@@ -743,11 +1221,46 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
     async def async_will_remove_from_hass(self):
         """Remove the listeners upon removing the component."""
         self._remove_listeners()
+        self._command_scheduler.remove_limits(self._name)
+        self.turn_on_off_listener.release_lights(self)
+        self._contexts.unregister()
 
     def _expand_light_groups(self) -> None:
-        all_lights = _expand_light_groups(self.hass, self._lights)
-        self.turn_on_off_listener.lights.update(all_lights)
-        self._lights = list(all_lights)
+        all_lights = _expand_light_groups(self.hass, self._configured_lights)
+        self.turn_on_off_listener.claim_lights(self, all_lights)
+        for light in self._locks.keys() - set(all_lights):
+            del self._locks[light]
+        for light in set(self._lights) - set(all_lights):
+            self._log.forget(f"manual:{light}")
+        self._lights = all_lights
+
+    def _track_lights(self) -> None:
+        self._untrack_lights()
+        if self._lights:
+            self._remove_light_tracker = async_track_state_change_event(
+                self.hass, self._lights, self._light_event
+            )
+
+    def _untrack_lights(self) -> None:
+        if self._remove_light_tracker is not None:
+            self._remove_light_tracker()
+            self._remove_light_tracker = None
+
+    @callback
+    def _light_groups_changed(self, affected: set[str]) -> None:
+        """Follow membership changes of the configured light groups."""
+        if affected.isdisjoint(self._configured_lights):
+            return
+        lights = self._lights
+        self._expand_light_groups()
+        if set(lights) != set(self._lights):
+            _LOGGER.debug("%s: Lights changed to %s", self._name, self._lights)
+            self._track_lights()
+            # Do not keep the manual control or the last target of a light
+            # from another switch or an earlier membership
+            added = set(self._lights) - set(lights)
+            if added:
+                self.turn_on_off_listener.reset(*added)
 
     async def _setup_listeners(self, _=None) -> None:
         _LOGGER.debug("%s: Called '_setup_listeners'", self._name)
@@ -759,9 +1272,13 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
 
         assert not self.remove_listeners
 
-        remove_interval = async_track_time_interval(
-            self.hass, self._async_update_at_interval, self._interval
-        )
+        if self._schedule_next_change:
+            self._schedule_next_update()
+            remove_interval = self._cancel_next_update
+        else:
+            remove_interval = async_track_time_interval(
+                self.hass, self._async_update_at_interval, self._interval
+            )
         remove_sleep = async_track_state_change_event(
             self.hass,
             self.sleep_mode_switch.entity_id,
@@ -770,20 +1287,64 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
 
         self.remove_listeners.extend([remove_interval, remove_sleep])
 
-        if self._lights:
+        if self._configured_lights:
             self._expand_light_groups()
-            remove_state = async_track_state_change_event(
-                self.hass, self._lights, self._light_event
-            )
-            self.remove_listeners.append(remove_state)
+            self._track_lights()
+            remove_groups = self.hass.data[DOMAIN][
+                ATTR_LIGHT_GROUPS
+            ].async_add_listener(self._light_groups_changed)
+            self.remove_listeners.extend([self._untrack_lights, remove_groups])
         _LOGGER.debug(
             "%s: Finished '_setup_listeners', start with Interval", self._name
         )
 
+    def _schedule_next_update(self) -> None:
+        """Arm a timer at the moment the light settings change visibly."""
+        self._cancel_next_update()
+        now = dt_util.utcnow()
+        try:
+            next_change = self._sun_light_settings.next_change(
+                now,
+                self.sleep_mode_switch.is_on,
+                100 * BRIGHTNESS_DEADBAND / 255,
+                COLOR_TEMP_DEADBAND,
+            )
+        except ValueError as error:
+            # E.g., the sun does not rise today, see `_calc_day_events`
+            if self._log.sample("next_change", logging.WARNING):
+                _LOGGER.warning(
+                    "%s: Cannot compute the next change (%s), update every %s",
+                    self._name,
+                    error,
+                    self._interval,
+                )
+            next_change = now + self._interval
+        if next_change is None:
+            next_change = now + _MAX_NEXT_CHANGE_DELAY
+        next_change = min(
+            max(next_change, now + _MIN_NEXT_CHANGE_DELAY),
+            now + _MAX_NEXT_CHANGE_DELAY,
+        )
+        _LOGGER.debug("%s: Next update at %s", self._name, next_change)
+        self._remove_next_update = async_track_point_in_utc_time(
+            self.hass, self._async_update_at_next_change, next_change
+        )
+
+    def _cancel_next_update(self) -> None:
+        if self._remove_next_update is not None:
+            self._remove_next_update()
+            self._remove_next_update = None
+
+    async def _async_update_at_next_change(self, now=None) -> None:
+        self._remove_next_update = None
+        self._schedule_next_update()
+        await self._async_update_at_interval(now)
+
     def _remove_listeners(self) -> None:
         while self.remove_listeners:
             remove_listener = self.remove_listeners.pop()
             remove_listener()
+        self._cancel_second_commands()
 
     @property
     def icon(self) -> str:
@@ -795,12 +1356,35 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
         """Return the attributes of the switch."""
         if not self.is_on:
             return {key: None for key in self._settings}
+        records = self.turn_on_off_listener.records
         manual_control = [
             light
             for light in self._lights
-            if self.turn_on_off_listener.manual_control.get(light)
+            if light in records and records[light].manual_control
         ]
-        return dict(self._settings, manual_control=manual_control)
+        owners = self.turn_on_off_listener.owners
+        shared_lights = {
+            light: self.turn_on_off_listener.owner(light).name
+            for light in self._lights
+            if len(owners.get(light, ())) > 1
+        }
+        return dict(
+            self._settings,
+            manual_control=manual_control,
+            shared_lights=shared_lights,
+            command_scheduler=self._command_scheduler.as_dict(),
+            **self.counters,
+        )
+
+    @property
+    def astral_computations(self) -> int:
+        """Return the number of astral solver runs of the current settings.
+
+        These are the ephemeris cache misses and the sun elevations, the
+        cache hits and the interpolation of the curve are not counted.
+        """
+        stats = self._sun_light_settings.stats
+        return stats["ephemeris"] + stats["solar_elevation"]
 
     def create_context(
         self, which: str = "default", parent: Optional[Context] = None
@@ -814,9 +1398,34 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
         # 'adapt_lgt_XXXX_light_event_999999999'
         # 'adapt_lgt_XXXX_service_9999999999999'
         # So 100 million calls before we run into the 36 chars limit.
-        context = create_context(self._name, which, self._context_cnt, parent=parent)
-        self._context_cnt += 1
-        return context
+        return self._contexts.create(which, parent=parent)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the internal state of the switch, for the diagnostics."""
+        records = self.turn_on_off_listener.records
+        return {
+            "is_on": self.is_on,
+            "configured_lights": self._configured_lights,
+            "lights": self._lights,
+            "settings": self._settings,
+            "last_pass_duration": self.last_pass_duration,
+            "commands_last_hour": self.commands_last_hour.total,
+            "counters": dict(self.counters),
+            "listeners": len(self.remove_listeners),
+            "next_update_scheduled": self._remove_next_update is not None,
+            "pending_second_commands": len(self._second_commands),
+            "created_contexts": self._contexts.count,
+            "locked_lights": [
+                light for light, lock in self._locks.items() if lock.locked()
+            ],
+            "suppressed_log_messages": self._log.suppressed,
+            "sun_settings": self._sun_light_settings.as_dict(),
+            "traces": {
+                light: [entry.as_dict() for entry in records[light].trace]
+                for light in self._lights
+                if light in records
+            },
+        }
 
     async def async_turn_on(  # pylint: disable=arguments-differ
         self, adapt_lights: bool = True
@@ -847,12 +1456,31 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
         self.turn_on_off_listener.reset(*self._lights)
 
     async def _async_update_at_interval(self, now=None) -> None:
-        _LOGGER.debug("%s: Loop control light", self._name)
+        if self._log.sample("interval"):
+            _LOGGER.debug("%s: Loop control light", self._name)
         await self._update_attrs_and_maybe_adapt_lights(
             transition=self._transition,
             force=False,
             context=self.create_context("interval"),
         )
+        if time.monotonic() - self._last_summary >= LOG_SUMMARY_INTERVAL:
+            self._log_summary()
+
+    def _log_summary(self) -> None:
+        """Log the counters, instead of a message per pass and light."""
+        self._last_summary = time.monotonic()
+        if not _LOGGER.isEnabledFor(logging.INFO):
+            return
+        _LOGGER.info(
+            "%s: %s commands in the last hour, last pass took %s ms, counters: %s,"
+            " %s astral computations, %s suppressed log messages",
+            self._name,
+            self.commands_last_hour.total,
+            self.last_pass_duration,
+            dict(self.counters),
+            self.astral_computations,
+            self._log.suppressed + self._sun_light_settings.log.suppressed,
+        )
 
     # COMMENT Function which prepares update data to Hass and updates with "light.turn_on" / "light.turn_off" on a single entity
     async def _adapt_light(
@@ -865,20 +1493,71 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
         extend_cct_rgb_color: Optional[bool] = None,
         force: bool = False,
         context: Optional[Context] = None,
+        poll: bool = False,
+    ) -> None:
+        if adapt_brightness is None:
+            adapt_brightness = self.adapt_brightness_switch.is_on
+        if adapt_color is None:
+            adapt_color = self.adapt_color_switch.is_on
+        context = context or self.create_context("adapt_lights")
+        service_data = await self._prepare_service_data(
+            light,
+            transition,
+            adapt_brightness,
+            adapt_color,
+            prefer_rgb_color,
+            extend_cct_rgb_color,
+            force,
+            context,
+            poll,
+        )
+        if service_data is not None:
+            await self._turn_on(service_data, adapt_brightness, adapt_color, context)
+
+    def _trace(
+        self,
+        light: str,
+        context: Optional[Context],
+        decision: str,
+        service_data: Optional[dict[str, Any]] = None,
     ) -> None:
+        """Record why 'light' is (not) adapted in its trace."""
+        attribution = self.turn_on_off_listener.attribute(context)
+        trigger = None if attribution is None else attribution[1]
+        entry = TraceEntry(time.time(), self._name, trigger, decision)
+        if service_data is not None:
+            entry = entry._replace(
+                brightness=service_data.get(ATTR_BRIGHTNESS),
+                color_temp=service_data.get(ATTR_COLOR_TEMP),
+                rgb_color=service_data.get(ATTR_RGB_COLOR),
+            )
+        self.turn_on_off_listener.record(light).trace.append(entry)
+
+    async def _prepare_service_data(
+        self,
+        light: str,
+        transition: Optional[int],
+        adapt_brightness: bool,
+        adapt_color: bool,
+        prefer_rgb_color: Optional[bool],
+        extend_cct_rgb_color: Optional[bool],
+        force: bool,
+        context: Context,
+        poll: bool = False,
+    ) -> Optional[dict[str, Any]]:
+        """Get the 'light.turn_on' service_data for 'light', None to skip it."""
+        record = self.turn_on_off_listener.record(light)
         lock = self._locks.get(light)
         if lock is not None and lock.locked():
             _LOGGER.debug("%s: '%s' is locked", self._name, light)
-            return
+            self._trace(light, context, "locked")
+            return None
         service_data = {ATTR_ENTITY_ID: light}
-        features = _supported_features(self.hass, light)
+        profile = _light_profile(self.hass, light)
+        features = profile.features
 
         if transition is None:
             transition = self._transition
-        if adapt_brightness is None:
-            adapt_brightness = self.adapt_brightness_switch.is_on
-        if adapt_color is None:
-            adapt_color = self.adapt_color_switch.is_on
         if prefer_rgb_color is None:
             prefer_rgb_color = self._prefer_rgb_color
         if extend_cct_rgb_color is None:
@@ -895,26 +1574,28 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
             white_value = round(255 * self._settings["brightness_pct"] / 100)
             service_data[ATTR_WHITE_VALUE] = white_value
 
+        # Integer RGB values, like the brightness and mireds, so that a target
+        # compares equal to the last one when the light would not change
+        rgb_color = tuple(map(round, self._settings["rgb_color"]))
+
         # TODO use max/min mired for transition between ct and rgb to extend CT Range of CCT / RGB entity
 
         if (
-            "color" in features and adapt_color and not "color_temp" in features
+            profile.rgb_only and adapt_color
         ):  # COMMENT: Logic for RGB and RGB CCT if RGB is prefered
-            service_data[ATTR_RGB_COLOR] = self._settings["rgb_color"]
+            service_data[ATTR_RGB_COLOR] = rgb_color
 
         if (
-            "color_temp" in features and adapt_color and not ("color" in features)
+            profile.color_temp_only and adapt_color
         ):  # COMMENT: Logic for CT only Lights and RGB CCT Lights if not RGB Color prefered
-            attributes = self.hass.states.get(light).attributes
-            min_mireds, max_mireds = attributes["min_mireds"], attributes["max_mireds"]
+            min_mireds, max_mireds = profile.min_mireds, profile.max_mireds
             color_temp_mired = self._settings["color_temp_mired"]
             # color_temp_mired = max(min(color_temp_mired, max_mireds), min_mireds)
             # service_data[ATTR_COLOR_TEMP] = color_temp_mired
         elif (
-            "color_temp" and "color" in features and adapt_color
+            profile.color_temp_and_rgb and adapt_color
         ):  # COMMENT: Logic for RGB CCT Lights to extend CT with RGB
-            attributes = self.hass.states.get(light).attributes
-            min_mireds, max_mireds = attributes["min_mireds"], attributes["max_mireds"]
+            min_mireds, max_mireds = profile.min_mireds, profile.max_mireds
             color_temp_mired = self._settings["color_temp_mired"]
             if (
                 (
@@ -924,7 +1605,7 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
                 or prefer_rgb_color
                 or (self._settings["use_night_color"] and self._settings["night"])
             ):
-                service_data[ATTR_RGB_COLOR] = self._settings["rgb_color"]
+                service_data[ATTR_RGB_COLOR] = rgb_color
             else:
                 color_temp_mired = max(min(color_temp_mired, max_mireds), min_mireds)
                 service_data[ATTR_COLOR_TEMP] = color_temp_mired
@@ -946,7 +1627,6 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
 
         ####
 
-        context = context or self.create_context("adapt_lights")
         if (
             self._take_over_control
             and self._detect_non_ha_changes
@@ -957,18 +1637,65 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
                 adapt_brightness,
                 adapt_color,
                 context,
+                poll=poll,
             )
         ):
-            return
-        self.turn_on_off_listener.last_service_data[light] = service_data
+            self._trace(light, context, "changed_outside_ha", service_data)
+            return None
+        if (
+            self._skip_unchanged_commands
+            and not force
+            and record.last_service_data is not None
+            and _within_deadband(record.last_service_data, service_data)
+        ):
+            self.counters["skipped_commands"] += 1
+            self._trace(light, context, "deadband", service_data)
+            return None
+        return service_data
+
+    async def _turn_on(
+        self,
+        service_data: dict[str, Any],
+        adapt_brightness: bool,
+        adapt_color: bool,
+        context: Context,
+    ) -> None:
+        """Send 'service_data' to 'light.turn_on' and remember it per light."""
+        lights = cv.ensure_list(service_data[ATTR_ENTITY_ID])
+        records = [self.turn_on_off_listener.record(light) for light in lights]
+        try:
+            await self._send_turn_on(
+                service_data, adapt_brightness, adapt_color, context
+            )
+        except BaseException:
+            # Not sent (e.g., cancelled while rate limited), so the next pass
+            # must not skip it as unchanged
+            for light, record in zip(lights, records):
+                record.last_service_data = None
+                self._trace(light, context, "failed", service_data)
+            raise
+        for light, record in zip(lights, records):
+            record.last_service_data = service_data
+            self._trace(light, context, "sent", service_data)
+
+    async def _send_turn_on(
+        self,
+        service_data: dict[str, Any],
+        adapt_brightness: bool,
+        adapt_color: bool,
+        context: Context,
+    ) -> None:
+        """Send 'service_data' to 'light.turn_on', split up if configured."""
 
         # Function which is sending actual data change to Hass
         async def turn_on(service_data):
-            _LOGGER.info(
-                "%s: Service called 'light.turn_on' on: %s",
-                self._name,
-                service_data,
-            )
+            # Every command is in the trace of the light, see `_trace`
+            if self._log.sample("turn_on"):
+                _LOGGER.debug(
+                    "%s: Service called 'light.turn_on' on: %s",
+                    self._name,
+                    service_data,
+                )
             # _LOGGER.debug(
             #     "%s: Scheduling 'light.turn_on' with the following 'service_data': %s"
             #     " with context.id='%s'",
@@ -977,8 +1704,12 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
             #     context.id,
             # )
 
-            # Call to send Data to Hass
-            await self.hass.services.async_call(
+            # Count the lights, like the skipped commands
+            n_lights = len(cv.ensure_list(service_data[ATTR_ENTITY_ID]))
+            self.counters["sent_commands"] += n_lights
+            self.commands_last_hour.add(n_lights)
+            # Call to send Data to Hass, within the limits of the command scheduler
+            await self._command_scheduler.async_call(
                 LIGHT_DOMAIN,
                 SERVICE_TURN_ON,
                 service_data,
@@ -987,18 +1718,64 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
 
         if not self._separate_turn_on_commands:
             await turn_on(service_data)
-        else:
-            # Could be a list of length 1 or 2
-            service_datas = _split_service_data(
-                service_data, adapt_brightness, adapt_color
-            )
-            items_service_datas = len(service_datas)
-            await turn_on(service_datas[0])
-            if items_service_datas == 2:
-                transition = service_datas[0].get(ATTR_TRANSITION)
-                if transition is not None:
-                    await asyncio.sleep(transition)
-                await turn_on(service_datas[1])
+            return
+
+        # Could be a list of length 1 or 2
+        service_datas = _split_service_data(service_data, adapt_brightness, adapt_color)
+        lights = cv.ensure_list(service_data[ATTR_ENTITY_ID])
+        # A newer pass supersedes the pending second command of an older one
+        self._cancel_second_commands(*lights)
+        await turn_on(service_datas[0])
+        if len(service_datas) == 1:
+            return
+        transition = service_datas[0].get(ATTR_TRANSITION)
+        if not transition:
+            await turn_on(service_datas[1])
+            return
+
+        # Send the second command when the first transition is done, without
+        # holding up the adaptation of the other lights
+        async def turn_on_second(_now) -> None:
+            for light in pending:
+                del self._second_commands[light]
+            if self._take_over_control:
+                # Do not undo a manual change made during the transition
+                pending.difference_update(
+                    [
+                        light
+                        for light in pending
+                        if self.turn_on_off_listener.is_manually_controlled(
+                            self, light, False, adapt_brightness, adapt_color
+                        )
+                    ]
+                )
+                if not pending:
+                    return
+            second = service_datas[1]
+            if len(pending) < len(lights):  # Cancelled for some of the batch
+                second = {
+                    **second,
+                    ATTR_ENTITY_ID: [light for light in lights if light in pending],
+                }
+            await turn_on(second)
+
+        pending = set(lights)
+        remove = async_call_later(self.hass, transition, turn_on_second)
+        for light in lights:
+            self._second_commands[light] = (remove, pending)
+
+    def _cancel_second_commands(self, *lights: str) -> None:
+        """Cancel the pending second commands of 'lights' (default: all).
+
+        The second command of a batch is still sent to its other lights.
+        """
+        for light in lights or list(self._second_commands):
+            remove, pending = self._second_commands.pop(light, (None, None))
+            if remove is None:
+                continue
+            pending.discard(light)
+            if not pending:
+                remove()
 
     async def _update_attrs_and_maybe_adapt_lights(
         self,
@@ -1022,7 +1799,9 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
             lights = self._lights
         if (self._only_once and not force) or not lights:
             return
+        start = time.perf_counter()
         await self._adapt_lights(lights, transition, force, context)
+        self.last_pass_duration = round(1000 * (time.perf_counter() - start), 1)
 
     async def _adapt_lights(
         self,
@@ -1040,9 +1819,14 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
             force,
             context.id,
         )
+        lights_to_adapt = []
         for light in lights:
             if not is_on(self.hass, light):
                 continue
+            if self.turn_on_off_listener.owner(light) not in (self, None):
+                # Also in another profile that takes precedence
+                self._trace(light, context, "other_switch")
+                continue
             if (
                 self._take_over_control
                 and self.turn_on_off_listener.is_manually_controlled(
@@ -1053,15 +1837,99 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
                     self.adapt_color_switch.is_on,
                 )
             ):
-                _LOGGER.warning(
-                    "%s: '%s' is being manually controlled, stop adapting, context.id=%s",
-                    self._name,
-                    light,
-                    context.id,
-                )
+                if self._log.sample(f"manual:{light}", logging.WARNING):
+                    _LOGGER.warning(
+                        "%s: '%s' is being manually controlled, stop adapting, context.id=%s",
+                        self._name,
+                        light,
+                        context.id,
+                    )
+                self.counters["manual_control_skips"] += 1
+                self._trace(light, context, "manual_control")
                 continue
-            # COMMENT Executing time independend coroutines for adapting a single entity in running loops
-            await self._adapt_light(light, transition, force=force, context=context)
+            # Not (or no longer) manually controlled, warn at once next time
+            self._log.forget(f"manual:{light}")
+            lights_to_adapt.append(light)
+        lights_to_poll: set[str] = set()
+        if self._take_over_control and self._detect_non_ha_changes and not force:
+            lights_to_poll = self.turn_on_off_listener.lights_to_poll(
+                lights_to_adapt, self._poll_budget, self._max_state_age
+            )
+            self.counters["polled_lights"] += len(lights_to_poll)
+        # COMMENT Executing time independend coroutines for adapting the entities concurrently
+        await self._adapt_lights_concurrently(
+            lights_to_adapt,
+            transition,
+            force=force,
+            context=context,
+            lights_to_poll=lights_to_poll,
+        )
+
+    async def _adapt_lights_concurrently(
+        self,
+        lights: list[str],
+        transition: Optional[int] = None,
+        adapt_brightness: Optional[bool] = None,
+        adapt_color: Optional[bool] = None,
+        prefer_rgb_color: Optional[bool] = None,
+        extend_cct_rgb_color: Optional[bool] = None,
+        force: bool = False,
+        context: Optional[Context] = None,
+        lights_to_poll: Collection[str] = (),
+    ) -> None:
+        """Adapt 'lights' concurrently, at most 'adapt_concurrency' at once.
+
+        The state of the 'lights_to_poll' is polled before it is checked for
+        changes outside of Home Assistant, see `significant_change`.
+        """
+        if adapt_brightness is None:
+            adapt_brightness = self.adapt_brightness_switch.is_on
+        if adapt_color is None:
+            adapt_color = self.adapt_color_switch.is_on
+        context = context or self.create_context("adapt_lights")
+
+        async def adapt_light(light: str) -> Optional[dict[str, Any]]:
+            args = (
+                light,
+                transition,
+                adapt_brightness,
+                adapt_color,
+                prefer_rgb_color,
+                extend_cct_rgb_color,
+                force,
+                context,
+                light in lights_to_poll,
+            )
+            async with self._adapt_semaphore:
+                try:
+                    if self._batch_turn_on_commands:
+                        # Only collect the service_data, it is sent in batches below
+                        return await self._prepare_service_data(*args)
+                    await self._adapt_light(*args)
+                except Exception:  # pylint: disable=broad-except
+                    # Do not let one failing light stop the adaptation of the others
+                    _LOGGER.exception("%s: Failed to adapt '%s'", self._name, light)
+                return None
+
+        async def turn_on(service_data: dict[str, Any]) -> None:
+            async with self._adapt_semaphore:
+                try:
+                    await self._turn_on(
+                        service_data, adapt_brightness, adapt_color, context
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "%s: Failed to adapt '%s'",
+                        self._name,
+                        service_data[ATTR_ENTITY_ID],
+                    )
+
+        service_datas = await asyncio.gather(*(adapt_light(light) for light in lights))
+        if self._batch_turn_on_commands:
+            # Send lights that get the same settings in one 'light.turn_on' call
+            await asyncio.gather(
+                *(turn_on(batch) for batch in _batch_service_data(service_datas))
+            )
 
     async def _sleep_mode_switch_state_event(self, event: Event) -> None:
         if not match_switch_state_event(event, (STATE_ON, STATE_OFF)):
@@ -1071,6 +1939,9 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
         )
         # Reset the manually controlled status when the "sleep mode" changes
         self.turn_on_off_listener.reset(*self._lights)
+        if self._remove_next_update is not None:
+            # The settings change differently in and out of sleep mode
+            self._schedule_next_update()
         _LOGGER.debug("%s: Sleep mode control light", self._name)
         await self._update_attrs_and_maybe_adapt_lights(
             transition=self._sleep_transition,
@@ -1095,8 +1966,9 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
                 event.context.id,
             )
             self.turn_on_off_listener.reset(entity_id, reset_manual_control=False)
+            record = self.turn_on_off_listener.record(entity_id)
             # Tracks 'off' → 'on' state changes
-            self._off_to_on_event[entity_id] = event
+            record.off_to_on_event = event
             lock = self._locks.get(entity_id)
             if lock is None:
                 lock = self._locks[entity_id] = asyncio.Lock()
@@ -1104,7 +1976,7 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
                 if await self.turn_on_off_listener.maybe_cancel_adjusting(
                     entity_id,
                     off_to_on_event=event,
-                    on_to_off_event=self._on_to_off_event.get(entity_id),
+                    on_to_off_event=record.on_to_off_event,
                 ):
                     # Stop if a rapid 'off' → 'on' → 'off' happens.
                     _LOGGER.warning(
@@ -1130,9 +2002,11 @@ class ArtifSunSwitch(SwitchEntity, RestoreEntity):
                 entity_id,
                 event.context.id,
             )
-            # Tracks 'off' → 'on' state changes
-            self._on_to_off_event[entity_id] = event
+            # Tracks 'on' → 'off' state changes
+            self.turn_on_off_listener.record(entity_id).on_to_off_event = event
             self.turn_on_off_listener.reset(entity_id)
+            # Do not turn the light back on with a pending second command
+            self._cancel_second_commands(entity_id)
 
 
 class SimpleSwitch(SwitchEntity, RestoreEntity):
@@ -1193,6 +2067,267 @@ class SimpleSwitch(SwitchEntity, RestoreEntity):
         self._state = False
 
 
+def _solve_or_none(solve: Callable[..., Any], *args: Any) -> Any:
+    """Solve a sun event, None when the sun does not reach it on the date."""
+    try:
+        return solve(*args)
+    except ValueError:
+        return None
+
+
+def _calc_ephemeris(
+    location: astral.location.Location,
+    elevation: float,
+    depression: float,
+    horizon: float,
+    date: datetime.date,
+) -> dict[str, Any]:
+    """Calculate the timestamps of the astral sun events at 'date'."""
+    # Use the astral functions with our own observers and depression
+    # instead of setting 'solar_depression' on the location that is
+    # shared with Home Assistant.
+    ground = astral.Observer(location.latitude, location.longitude)
+    observer = astral.Observer(location.latitude, location.longitude, elevation)
+    rising = astral.SunDirection.RISING
+    setting = astral.SunDirection.SETTING
+
+    events = {}
+
+    # New Values for Brightness render
+    events["dawn"] = astral.sun.dawn(observer, date, depression)
+    events["dusk"] = astral.sun.dusk(observer, date, depression)
+    # A profile with manual 'sunrise_time' and 'sunset_time' does not need the
+    # events below, so a day on which the sun does not rise or set (at polar
+    # latitudes) must not fail here, see `SunSettings._calc_day_events`
+    events["lscpe_hrzn_mrng"] = _solve_or_none(
+        astral.sun.time_at_elevation, ground, horizon, date, rising
+    )
+    events["lscpe_hrzn_eve"] = _solve_or_none(
+        astral.sun.time_at_elevation, ground, horizon, date, setting
+    )
+    (events["daylight_strt"], events["daylight_end"]) = _solve_or_none(
+        astral.sun.daylight, ground, date
+    ) or (None, None)
+    (events["night_strt"], events["night_end"]) = _solve_or_none(
+        astral.sun.night, ground, date
+    ) or (None, None)
+    events["sunrise"] = _solve_or_none(astral.sun.sunrise, observer, date)
+    events["sunset"] = _solve_or_none(astral.sun.sunset, observer, date)
+
+    # From here: get Color Render Values
+    events["solar_noon"] = astral.sun.noon(ground, date)
+    events["solar_midnight"] = astral.sun.midnight(ground, date)
+    (
+        events["bl_hr_mrnng_strt"],
+        events["bl_hr_mrnng_end"],
+    ) = astral.sun.blue_hour(observer, date, rising)
+    (
+        events["bl_hr_nght_strt"],
+        events["bl_hr_nght_end"],
+    ) = astral.sun.blue_hour(observer, date, setting)
+    (
+        events["gldn_hr_mrnng_strt"],
+        events["gldn_hr_mrnng_end"],
+    ) = astral.sun.golden_hour(observer, date, rising)
+    (
+        events["gldn_hr_nght_strt"],
+        events["gldn_hr_nght_end"],
+    ) = astral.sun.golden_hour(observer, date, setting)
+
+    # Only the date of the solar midnight is needed as a 'datetime'
+    midnight_date = events["solar_midnight"].date()
+    events = {
+        key: math.nan if value is None else value.timestamp()
+        for key, value in events.items()
+    }
+    events["solar_midnight_date"] = midnight_date
+    return events
+
+
+class EphemerisCache:
+    """Cache of the astral sun events that is shared by all switches.
+
+    The events are keyed by the observer (latitude, longitude, elevation),
+    the twilight depression, the landscape horizon and the date, so N
+    profiles at the same location solve the ephemeris only once per day.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the EphemerisCache."""
+        self._cache: dict[tuple, dict[str, Any]] = {}
+        self._newest_date: Optional[datetime.date] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        location: astral.location.Location,
+        elevation: float,
+        depression: float,
+        horizon: float,
+        date: datetime.date,
+    ) -> dict[str, Any]:
+        """Get the astral sun events at 'date', only calculate them on a miss."""
+        key = (location.latitude, location.longitude, elevation, depression, horizon)
+        events = self._cache.get(key + (date,))
+        if events is not None:
+            self.hits += 1
+            return events
+        self.misses += 1
+        events = _calc_ephemeris(location, elevation, depression, horizon, date)
+        self._cache[key + (date,)] = events
+        if self._newest_date is None or date > self._newest_date:
+            self._newest_date = date
+            self._evict()
+        _LOGGER.debug(
+            "Calculated the sun events for %s at %s (cache hits=%s, misses=%s)",
+            key,
+            date,
+            self.hits,
+            self.misses,
+        )
+        return events
+
+    def _evict(self) -> None:
+        """Remove the dates that no `SunSettings` asks for anymore."""
+        oldest_date = self._newest_date - timedelta(days=_DAY_EVENTS_CACHE_SIZE - 1)
+        for key in [key for key in self._cache if key[-1] < oldest_date]:
+            del self._cache[key]
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the size and the hit/miss counters of the cache."""
+        return {"size": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+class SunEvents(NamedTuple):
+    """Timestamps of the sun events that are relevant at a moment.
+
+    Returned by `SunSettings.get_sun_events` and used as input for the
+    brightness and color temperature calculations. It is an immutable
+    tuple, so it can be cached and shared between switches and threads.
+    """
+
+    dawn: float
+    dusk: float
+    lscpe_hrzn_mrng: float
+    lscpe_hrzn_eve: float
+    daylight_strt: float
+    daylight_end: float
+    night_strt: float
+    night_end: float
+    sunrise: float
+    sunset: float
+    solar_noon: float
+    solar_midnight: float
+    prev_solar_midnight: float
+    next_solar_midnight: float
+    next_bl_hr_mrnng_strt: float
+    bl_hr_mrnng_strt: float
+    bl_hr_mrnng_end: float
+    bl_hr_nght_strt: float
+    bl_hr_nght_end: float
+    gldn_hr_mrnng_strt: float
+    gldn_hr_mrnng_end: float
+    gldn_hr_nght_strt: float
+    gldn_hr_nght_end: float
+
+
+# The sun events at which a new segment of the brightness or color temperature
+# curve starts, the other fields of `SunEvents` do not change the settings
+_SEGMENT_BOUNDARIES = (
+    "dawn",
+    "dusk",
+    "sunrise",
+    "sunset",
+    "solar_noon",
+    "prev_solar_midnight",
+    "next_solar_midnight",
+    "next_bl_hr_mrnng_strt",
+    "bl_hr_mrnng_strt",
+    "bl_hr_nght_end",
+    "gldn_hr_mrnng_strt",
+    "gldn_hr_mrnng_end",
+    "gldn_hr_nght_strt",
+    "gldn_hr_nght_end",
+)
+
+
+class DailyCurve(NamedTuple):
+    """Light settings of one local day, sampled every `_CURVE_RESOLUTION`.
+
+    Built once per day by `SunSettings.get_curve`, after which the settings
+    at any moment of that day are a linear interpolation of two samples.
+    """
+
+    date: datetime.date
+    start: float
+    step: float
+    brightness_pct: array.array
+    color_temp_kelvin: array.array
+    color_temp_mired: array.array
+    red: array.array
+    green: array.array
+    blue: array.array
+    night: bytearray
+
+    def interpolate(
+        self, now: float
+    ) -> tuple[float, float, int, tuple[int, int, int], bool]:
+        """Get the brightness, color temperature, rgb and night at timestamp 'now'."""
+        position = (now - self.start) / self.step
+        index = min(max(int(position), 0), len(self.night) - 2)
+        frac = min(max(position - index, 0.0), 1.0)
+
+        def _lerp(values: array.array) -> float:
+            return values[index] + (values[index + 1] - values[index]) * frac
+
+        red, green, blue = _lerp(self.red), _lerp(self.green), _lerp(self.blue)
+        return (
+            _lerp(self.brightness_pct),
+            _lerp(self.color_temp_kelvin),
+            math.floor(_lerp(self.color_temp_mired)),
+            (int(red), int(green), int(blue)),
+            bool(self.night[index]),
+        )
+
+    def next_change(
+        self, now: float, brightness_step: float, mired_step: float
+    ) -> float:
+        """Get the first timestamp after 'now' at which the settings visibly change.
+
+        That is when the brightness changes more than 'brightness_step' %,
+        the color temperature more than 'mired_step' mired or when it turns
+        day or night. Returns the end of the curve if nothing changes anymore.
+        """
+        position = (now - self.start) / self.step
+        index = min(max(int(position), 0), len(self.night) - 2)
+        frac = min(max(position - index, 0.0), 1.0)
+        night = self.night[index]
+        steps = []
+        for values, step in (
+            (self.brightness_pct, brightness_step),
+            (self.color_temp_mired, mired_step),
+        ):
+            current = values[index] + (values[index + 1] - values[index]) * frac
+            steps.append((values, current, step))
+
+        for index in range(index + 1, len(self.night)):
+            crossings = []
+            for values, current, step in steps:
+                delta = values[index] - current
+                if abs(delta) > step:
+                    # Linear between two samples, so solve for the crossing
+                    previous = values[index - 1] - current
+                    target = math.copysign(step, delta)
+                    crossings.append((target - previous) / (delta - previous))
+            if crossings:
+                crossing = self.start + (index - 1 + min(crossings)) * self.step
+                return max(now, crossing)
+            if self.night[index] != night:
+                return self.start + index * self.step
+        return self.start + (len(self.night) - 1) * self.step
+
+
 @dataclass(frozen=True)
 class SunSettings:
     """Sunlight Settings: Track the state of the sun and associated light settings."""
@@ -1210,7 +2345,7 @@ class SunSettings:
     sunrise_time: Optional[datetime.time]
     sunset_offset: Optional[datetime.timedelta]
     sunset_time: Optional[datetime.time]
-    time_zone: datetime.tzinfo
+    time_zone: Union[str, datetime.tzinfo]
     transition: int
     depression: str
     horizon: float
@@ -1221,168 +2356,106 @@ class SunSettings:
     bl_hr_ct: int
     use_night_color: Optional[bool]
     night_col: tuple[int, int, int]
+    ephemeris: EphemerisCache = field(
+        default_factory=EphemerisCache, repr=False, compare=False
+    )
 
-    def get_sun_events(self, date: datetime.datetime) -> dict[str, float]:
-        """Get the four sun event's timestamps at 'date'."""
-        # This function is called three times, for yesterday, today and tomorrow for the current date each interval
+    # Number of sun calculations, by kind
+    stats: Counter[str] = field(
+        default_factory=Counter, init=False, repr=False, compare=False
+    )
+    # Samples the debug message of `get_settings`, which runs on every pass
+    log: SampledLog = field(
+        default_factory=SampledLog, init=False, repr=False, compare=False
+    )
+    # Lighting curve of the current local day, see `get_curve`
+    _curve_cache: dict[datetime.date, DailyCurve] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # Cache of the sun events that only depend on the date, see `_get_day_events`
+    _day_events_cache: dict[datetime.date, dict[str, Any]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
-        def _replace_time(date: datetime.datetime, time) -> datetime.datetime:
+    @functools.cached_property
+    def tzinfo(self) -> datetime.tzinfo:
+        """The time zone of the local days, 'time_zone' can also be its name."""
+        if isinstance(self.time_zone, str):
+            return dt_util.get_time_zone(self.time_zone) or dt_util.DEFAULT_TIME_ZONE
+        return self.time_zone
+
+    def _get_day_events(self, date: datetime.date) -> dict[str, Any]:
+        """Get the sun events at 'date', computed at most once per date.
+
+        The sun events only change once per day, so only the first call for
+        a date looks them up in the `EphemerisCache`. Only the most recent dates are kept
+        (yesterday, today, tomorrow and the day after, which is needed because
+        the events of a day also look at the next day). A changed config
+        results in a new (frozen) `SunSettings` and thus in an empty cache.
+        """
+        cache = self._day_events_cache
+        day_events = cache.get(date)
+        if day_events is None:
+            day_events = cache[date] = self._calc_day_events(date)
+            while len(cache) > _DAY_EVENTS_CACHE_SIZE:
+                del cache[min(cache)]
+        return day_events
+
+    def _calc_day_events(self, date: datetime.date) -> dict[str, Any]:
+        """Calculate the timestamps of the sun events that only depend on 'date'."""
+
+        def _replace_time(date: datetime.date, time) -> datetime.datetime:
             date_time = datetime.datetime.combine(date, time)
             try:  # HA ≤2021.05, https://github.com/basnijholt/adaptive-lighting/issues/128
-                utc_time = self.time_zone.localize(date_time).astimezone(dt_util.UTC)
+                utc_time = self.tzinfo.localize(date_time).astimezone(dt_util.UTC)
             except AttributeError:  # HA ≥2021.06
-                utc_time = date_time.replace(
-                    tzinfo=dt_util.DEFAULT_TIME_ZONE
-                ).astimezone(dt_util.UTC)
+                utc_time = date_time.replace(tzinfo=self.tzinfo).astimezone(dt_util.UTC)
             return utc_time
 
-        # TODO reorganize astral using own Observer instead HASS integrated function
-        location = self.astral_location
-
-        # Preperation for fetching Sun Values
-        location.solar_depression = self.depression
-        rising = astral.SunDirection.RISING
-        setting = astral.SunDirection.SETTING
-
-        # TODO Reorganize with Local TZ
-
-        # New Values for Brightness render
-        SunSettings.dawn = location.dawn(
-            date, local=False, observer_elevation=self.elevation_observer
-        )
-        SunSettings.dusk = location.dusk(
-            date, local=False, observer_elevation=self.elevation_observer
-        )
-        SunSettings.lscpe_hrzn_mrng = location.time_at_elevation(
-            self.horizon, date, rising, local=False
-        )
-        SunSettings.lscpe_hrzn_eve = location.time_at_elevation(
-            self.horizon, date, setting, local=False
-        )
-        (SunSettings.daylight_strt, SunSettings.daylight_end) = location.daylight(
-            date, local=False
-        )
-        (SunSettings.night_strt, SunSettings.night_end) = location.night(
-            date, local=False
+        self.stats["day_events"] += 1
+        # The astral events are shared with all switches at the same location,
+        # only count the times that this profile made the cache solve them
+        misses = self.ephemeris.misses
+        events = self.ephemeris.get(
+            self.astral_location,
+            self.elevation_observer,
+            self.depression,
+            self.horizon,
+            date,
         )
+        self.stats["ephemeris"] += self.ephemeris.misses - misses
+        events = dict(events)
 
         # Get Sunrise and Sunset depending on Sun Depression Setting  with additional Offset or manual set Times with additional Offset
         if self.horizon and (self.sunrise_time is None or self.sunset_time is None):
-            SunSettings.sunrise = SunSettings.lscpe_hrzn_mrng
-            SunSettings.sunset = SunSettings.lscpe_hrzn_eve
+            sunrise = events["lscpe_hrzn_mrng"]
+            sunset = events["lscpe_hrzn_eve"]
         else:
-            SunSettings.sunrise = (
-                location.sunrise(
-                    date, local=False, observer_elevation=self.elevation_observer
-                )
+            sunrise = (
+                events["sunrise"]
                 if self.sunrise_time is None
-                else _replace_time(date, (getattr(self, "sunrise_time")))
+                else _replace_time(date, self.sunrise_time).timestamp()
             )
-            SunSettings.sunset = (
-                location.sunset(
-                    date, local=False, observer_elevation=self.elevation_observer
-                )
+            sunset = (
+                events["sunset"]
                 if self.sunset_time is None
-                else _replace_time(date, (getattr(self, "sunset_time")))
+                else _replace_time(date, self.sunset_time).timestamp()
             )
-        SunSettings.sunrise += self.sunrise_offset
-        SunSettings.sunset += self.sunset_offset
-
-        # From here: get Color Render Values
-        SunSettings.solar_noon = location.noon(date, local=False)
-        SunSettings.solar_midnight = location.midnight(date, local=False)
-        # + timedelta(days=1)
-        if (
-            SunSettings.solar_midnight.date() < date.date()
-            and SunSettings.solar_noon < date
-        ):
-            # if SunSettings.solar_midnight.date() == (date.date() - timedelta(days=2)):
-            SunSettings.prev_solar_midnight = location.midnight(
-                (date + timedelta(days=1)), local=False
-            )
-            SunSettings.next_solar_midnight = location.midnight(
-                (date + timedelta(days=1)), local=False
-            )
-            (SunSettings.next_bl_hr_mrnng_strt, _,) = location.blue_hour(
-                rising,
-                (date + timedelta(days=1)),
-                local=False,
-                observer_elevation=self.elevation_observer,
-            )
-        else:
-            SunSettings.next_solar_midnight = location.midnight(
-                (date + timedelta(days=1)), local=False
-            )
-            SunSettings.prev_solar_midnight = location.midnight(date, local=False)
-            (SunSettings.next_bl_hr_mrnng_strt, _,) = location.blue_hour(
-                rising,
-                date,
-                local=False,
-                observer_elevation=self.elevation_observer,
-            )
-        (
-            SunSettings.bl_hr_mrnng_strt,
-            SunSettings.bl_hr_mrnng_end,
-        ) = location.blue_hour(
-            rising,
-            date,
-            local=False,
-            observer_elevation=self.elevation_observer,
-        )
-        (SunSettings.bl_hr_nght_strt, SunSettings.bl_hr_nght_end,) = location.blue_hour(
-            setting,
-            date,
-            local=False,
-            observer_elevation=self.elevation_observer,
-        )
-        (
-            SunSettings.gldn_hr_mrnng_strt,
-            SunSettings.gldn_hr_mrnng_end,
-        ) = location.golden_hour(
-            rising,
-            date,
-            local=False,
-            observer_elevation=self.elevation_observer,
-        )
-        (
-            SunSettings.gldn_hr_nght_strt,
-            SunSettings.gldn_hr_nght_end,
-        ) = location.golden_hour(
-            setting,
-            date,
-            local=False,
-            observer_elevation=self.elevation_observer,
-        )
-
-        # get current solar elevation
-        SunSettings.solar_elevation = location.solar_elevation(date)
-
-        events = [
-            (EVENT_SUNRISE, SunSettings.sunrise.timestamp()),
-            (EVENT_SUNSET, SunSettings.sunset.timestamp()),
-            (EVENT_NOON, SunSettings.solar_noon.timestamp()),
-            (EVENT_MIDNIGHT, SunSettings.solar_midnight.timestamp()),
+        if math.isnan(sunrise) or math.isnan(sunset):
+            raise ValueError(f"The sun does not rise or set on {date}")
+        events["sunrise"] = sunrise + self.sunrise_offset.total_seconds()
+        events["sunset"] = sunset + self.sunset_offset.total_seconds()
+
+        order = [
+            (EVENT_SUNRISE, events["sunrise"]),
+            (EVENT_SUNSET, events["sunset"]),
+            (EVENT_NOON, events["solar_noon"]),
+            (EVENT_MIDNIGHT, events["solar_midnight"]),
         ]
-        # events_illum = [
-        #     EVENT_DAWN,
-        #     EVENT_SUNRISE,
-        #     EVENT_SUNSET,
-        #     EVENT_DUSK,
-        # ]
-        # event_ct = [
-        #     EVENT_BLUE_HOUR_MORNING,
-        #     EVENT_BLUE_GOLDEN_TRANSITION,
-        #     EVENT_GOLDEN_HOUR_MORNING,
-        #     EVENT_NOON,
-        #     EVENT_GOLDEN_HOUR_EVENING,
-        #     EVENT_GOLDEN_BLUE_TRANSITION,
-        #     EVENT_BLUE_HOUR_EVENING,
-        #     EVENT_MIDNIGHT,
-        # ]
 
         # Check whether order is correct
-        events = sorted(events, key=lambda x: x[1])
-        events_names, _ = zip(*events)
+        order = sorted(order, key=lambda x: x[1])
+        events_names, _ = zip(*order)
         if events_names not in _ALLOWED_ORDERS:
             msg = (
                 "{self.name}: The sun events {events_names} are not in the expected"
@@ -1392,23 +2465,158 @@ class SunSettings:
             )
             _LOGGER.error(msg)
             raise ValueError(msg)
-
+        events["order"] = order
         return events
 
+    def get_sun_events(self, date: datetime.datetime) -> SunEvents:
+        """Get the timestamps of the sun events that are relevant at 'date'."""
+        # The date-only events are cached, only the choice between the
+        # previous and next midnight depends on the time of 'date'.
+        today = self._get_day_events(date.date())
+        tomorrow = self._get_day_events(date.date() + timedelta(days=1))
+        if (
+            today["solar_midnight_date"] < date.date()
+            and today["solar_noon"] < date.timestamp()
+        ):
+            prev_solar_midnight = tomorrow["solar_midnight"]
+            next_bl_hr_mrnng_strt = tomorrow["bl_hr_mrnng_strt"]
+        else:
+            prev_solar_midnight = today["solar_midnight"]
+            next_bl_hr_mrnng_strt = today["bl_hr_mrnng_strt"]
+        return SunEvents(
+            dawn=today["dawn"],
+            dusk=today["dusk"],
+            lscpe_hrzn_mrng=today["lscpe_hrzn_mrng"],
+            lscpe_hrzn_eve=today["lscpe_hrzn_eve"],
+            daylight_strt=today["daylight_strt"],
+            daylight_end=today["daylight_end"],
+            night_strt=today["night_strt"],
+            night_end=today["night_end"],
+            sunrise=today["sunrise"],
+            sunset=today["sunset"],
+            solar_noon=today["solar_noon"],
+            solar_midnight=today["solar_midnight"],
+            prev_solar_midnight=prev_solar_midnight,
+            next_solar_midnight=tomorrow["solar_midnight"],
+            next_bl_hr_mrnng_strt=next_bl_hr_mrnng_strt,
+            bl_hr_mrnng_strt=today["bl_hr_mrnng_strt"],
+            bl_hr_mrnng_end=today["bl_hr_mrnng_end"],
+            bl_hr_nght_strt=today["bl_hr_nght_strt"],
+            bl_hr_nght_end=today["bl_hr_nght_end"],
+            gldn_hr_mrnng_strt=today["gldn_hr_mrnng_strt"],
+            gldn_hr_mrnng_end=today["gldn_hr_mrnng_end"],
+            gldn_hr_nght_strt=today["gldn_hr_nght_strt"],
+            gldn_hr_nght_end=today["gldn_hr_nght_end"],
+        )
+
+    def solar_elevation(self, now: datetime.datetime) -> float:
+        """Get the elevation of the sun at 'now' in degrees."""
+        self.stats["solar_elevation"] += 1
+        location = self.astral_location
+        observer = astral.Observer(location.latitude, location.longitude)
+        return astral.sun.elevation(observer, now)
+
     def relevant_events(self, now: datetime.datetime) -> list[tuple[str, float]]:
         """Get the previous and next sun event."""
         events = [
-            self.get_sun_events(now + timedelta(days=days))
+            self._get_day_events((now + timedelta(days=days)).date())["order"]
             for days in [-1, 0, 1]
             # stores sun events for yesterday, today and tomorrow into an events dict.
         ]
-        # print("events: " + str(events))
         events = sum(events, [])  # flatten lists
         events = sorted(events, key=lambda x: x[1])
-        # print("events: " + str(events))
         i_now = bisect.bisect([ts for _, ts in events], now.timestamp())
         return events[i_now - 1 : i_now + 1]
 
+    def as_dict(self) -> dict[str, int]:
+        """Return the sizes of the caches and the number of sun calculations."""
+        return {
+            "day_events_cache": len(self._day_events_cache),
+            "curve_cache": len(self._curve_cache),
+            "suppressed_log_messages": self.log.suppressed,
+            **self.stats,
+        }
+
+    def get_curve(self, now: datetime.datetime) -> DailyCurve:
+        """Get the lighting curve of the local day of 'now'.
+
+        The curve is built on the first call of a new local day (in
+        'time_zone'), so it is rebuilt at local midnight. A config change
+        creates a new (frozen) `SunSettings` and thus a new curve.
+        """
+        date = now.astimezone(self.tzinfo).date()
+        curve = self._curve_cache.get(date)
+        if curve is None:
+            self.stats["curves"] += 1
+            curve = self._build_curve(date)
+            self._curve_cache.clear()
+            self._curve_cache[date] = curve
+        return curve
+
+    def next_change(
+        self,
+        now: datetime.datetime,
+        is_sleep: bool,
+        brightness_step: float,
+        mired_step: float,
+    ) -> Optional[datetime.datetime]:
+        """Get the next moment after 'now' at which the settings visibly change.
+
+        This is the first moment at which the curve moved more than
+        'brightness_step' % or 'mired_step' mired, or the next sun event
+        where a new segment of the curve starts, whichever comes first.
+        None if the settings do not change, i.e., in sleep mode.
+        """
+        if is_sleep:
+            return None
+        now = now.astimezone(pytz.utc)
+        timestamp = now.timestamp()
+        next_change = self.get_curve(now).next_change(
+            timestamp, brightness_step, mired_step
+        )
+        events = self.get_sun_events(now)
+        boundaries = (getattr(events, name) for name in _SEGMENT_BOUNDARIES)
+        next_event = min(
+            (event for event in boundaries if event > timestamp),
+            default=next_change,
+        )
+        return dt_util.utc_from_timestamp(min(next_change, next_event))
+
+    def _build_curve(self, date: datetime.date) -> DailyCurve:
+        """Sample the light settings of the local day 'date'."""
+        start = datetime.datetime.combine(date, datetime.time(), self.tzinfo)
+        end = datetime.datetime.combine(
+            date + timedelta(days=1), datetime.time(), self.tzinfo
+        )
+        step = _CURVE_RESOLUTION.total_seconds()
+        # Timestamps, the days on which the DST changes are 23 or 25 hours
+        n_samples = math.ceil((end.timestamp() - start.timestamp()) / step) + 1
+        timestamps = [start.timestamp() + index * step for index in range(n_samples)]
+        values = evaluate(timestamps, [self])
+        color_temp_kelvin = list(values["color_temp_kelvin"][0])
+        red, green, blue = zip(*map(color_temperature_to_rgb, color_temp_kelvin))
+        curve = DailyCurve(
+            date=date,
+            start=timestamps[0],
+            step=step,
+            brightness_pct=array.array("d", values["brightness_pct"][0]),
+            color_temp_kelvin=array.array("d", color_temp_kelvin),
+            color_temp_mired=array.array(
+                "d", map(color_temperature_kelvin_to_mired, color_temp_kelvin)
+            ),
+            red=array.array("d", red),
+            green=array.array("d", green),
+            blue=array.array("d", blue),
+            night=bytearray(map(bool, values["night"][0])),
+        )
+        _LOGGER.debug(
+            "%s: Built the lighting curve of %s with %s samples",
+            self.name,
+            date,
+            n_samples,
+        )
+        return curve
+
     # def calc_percent(self, transition: int) -> float:
     #     """Calculate the position of the sun in %."""
     #     now = dt_util.utcnow()
@@ -1457,243 +2665,269 @@ class SunSettings:
         pct = abs(val ** (1 / 8))
         return pct
 
-    def calc_brightness_pct(self, now, is_sleep: bool) -> float:
-        """Calculate the natural brightness of the sun in %."""
+    def calc_brightness_pct(
+        self, events: SunEvents, now: float, is_sleep: bool
+    ) -> float:
+        """Calculate the natural brightness of the sun in % at timestamp 'now'."""
         if is_sleep:
             return self.sleep_brightness
 
         delta_brightness = self.max_brightness - self.min_brightness
 
-        if SunSettings.dawn < now < SunSettings.sunrise:
+        if events.dawn < now < events.sunrise:
             # brightness transistion morning
             morning_pct = self.calc_pct_exp(
                 now,
-                SunSettings.dawn,
-                SunSettings.sunrise,
-                SunSettings.dawn,
+                events.dawn,
+                events.sunrise,
+                events.dawn,
             )
             perct = (delta_brightness * morning_pct) + self.min_brightness
             return perct
 
-        if SunSettings.sunset < now < SunSettings.dusk:
+        if events.sunset < now < events.dusk:
             # brightness transistion evening
             evening_pct = self.calc_pct_exp(
-                SunSettings.dusk,
+                events.dusk,
                 now,
-                SunSettings.dusk,
-                SunSettings.sunset,
+                events.dusk,
+                events.sunset,
             )
             perct = (delta_brightness * evening_pct) + self.min_brightness
             return perct
 
-        if SunSettings.sunrise <= now <= SunSettings.sunset:
+        if events.sunrise <= now <= events.sunset:
             return self.max_brightness
 
         return self.min_brightness
 
-    def calc_color_temp_kelvin1(self, now: float, is_sleep: bool) -> float:
-        """Calculate the color temperature in Kelvin."""
+    def calc_color_temp_kelvin1(
+        self, events: SunEvents, now: float, is_sleep: bool
+    ) -> tuple[float, bool]:
+        """Calculate the color temperature in Kelvin at timestamp 'now'.
+
+        Returns the color temperature and whether it is night.
+        """
         if is_sleep:
             night = False
-            return self.sleep_color_temp
+            return self.sleep_color_temp, night
+        # Runs for every sample of the curve, don't build the arguments for nothing
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
 
         # Midnight till blue hour ct transistion
         # - Subprocess is tested
         # TODO Needs to work with Colors, if Night Color Mode is enabled
         # [ ]  Subprocess is tested
-        if SunSettings.prev_solar_midnight < now < SunSettings.next_bl_hr_mrnng_strt:
+        if events.prev_solar_midnight < now < events.next_bl_hr_mrnng_strt:
             # night to morning transistion
             night = True
             pct = self.calc_pct_sqrt6(
-                SunSettings.next_bl_hr_mrnng_strt,
+                events.next_bl_hr_mrnng_strt,
                 now,
-                SunSettings.next_bl_hr_mrnng_strt,
-                SunSettings.prev_solar_midnight,
+                events.next_bl_hr_mrnng_strt,
+                events.prev_solar_midnight,
             )
             c_t = ((self.min_color_temp - self.dawn_ct) * pct) + self.dawn_ct
-            _LOGGER.debug(
-                "CT %s Midnight %s -> Blue Hour %s  pct: %s",
-                c_t,
-                SunSettings.prev_solar_midnight,
-                SunSettings.next_bl_hr_mrnng_strt,
-                pct,
-            )
+            if debug:
+                _LOGGER.debug(
+                    "CT %s Midnight %s -> Blue Hour %s  pct: %s",
+                    c_t,
+                    events.prev_solar_midnight,
+                    events.next_bl_hr_mrnng_strt,
+                    pct,
+                )
             return c_t, night
 
         # Blue Hour to golden hour ct transistion
         # [ ] Subprocess is tested
-        if SunSettings.bl_hr_mrnng_strt <= now < SunSettings.gldn_hr_mrnng_strt:
+        if events.bl_hr_mrnng_strt <= now < events.gldn_hr_mrnng_strt:
             # night to morning transistion
             night = False
             pct = self.calc_pct_sqrt(
                 now,
-                SunSettings.bl_hr_mrnng_strt,
-                SunSettings.gldn_hr_mrnng_strt,
-                SunSettings.bl_hr_mrnng_strt,
+                events.bl_hr_mrnng_strt,
+                events.gldn_hr_mrnng_strt,
+                events.bl_hr_mrnng_strt,
             )
             c_t = ((self.bl_hr_ct - self.dawn_ct) * pct) + self.dawn_ct
-            _LOGGER.debug(
-                "CT %s Blue Hour Morning %s -> Golden Hour %s  pct: %s",
-                c_t,
-                SunSettings.bl_hr_mrnng_strt,
-                SunSettings.gldn_hr_mrnng_strt,
-                pct,
-            )
+            if debug:
+                _LOGGER.debug(
+                    "CT %s Blue Hour Morning %s -> Golden Hour %s  pct: %s",
+                    c_t,
+                    events.bl_hr_mrnng_strt,
+                    events.gldn_hr_mrnng_strt,
+                    pct,
+                )
             return c_t, night
 
         # golden Hour to sunrise ct transistion
         # [ ] Subprocess is tested
-        if SunSettings.gldn_hr_mrnng_strt <= now < SunSettings.gldn_hr_mrnng_end:
+        if events.gldn_hr_mrnng_strt <= now < events.gldn_hr_mrnng_end:
             # night to morning transistion
             night = False
             pct = self.calc_pct_sqrt(
                 now,
-                SunSettings.gldn_hr_mrnng_strt,
-                SunSettings.gldn_hr_mrnng_end,
-                SunSettings.gldn_hr_mrnng_strt,
+                events.gldn_hr_mrnng_strt,
+                events.gldn_hr_mrnng_end,
+                events.gldn_hr_mrnng_strt,
             )
             c_t = ((self.sunrise_ct - self.bl_hr_ct) * pct) + self.bl_hr_ct
-            _LOGGER.debug(
-                "CT %s Golden Hour Morning %s -> Morning %s  pct: %s",
-                c_t,
-                SunSettings.gldn_hr_mrnng_strt,
-                SunSettings.gldn_hr_mrnng_end,
-                pct,
-            )
+            if debug:
+                _LOGGER.debug(
+                    "CT %s Golden Hour Morning %s -> Morning %s  pct: %s",
+                    c_t,
+                    events.gldn_hr_mrnng_strt,
+                    events.gldn_hr_mrnng_end,
+                    pct,
+                )
             return c_t, night
 
         # sunrise to noon ct transistion
         # [ ]  Subprocess is tested
-        if SunSettings.gldn_hr_mrnng_end <= now < SunSettings.solar_noon:
+        if events.gldn_hr_mrnng_end <= now < events.solar_noon:
             # night to morning transistion
             night = False
             pct = self.calc_pct_sqrt4(
                 now,
-                SunSettings.gldn_hr_mrnng_end,
-                SunSettings.solar_noon,
-                SunSettings.gldn_hr_mrnng_end,
+                events.gldn_hr_mrnng_end,
+                events.solar_noon,
+                events.gldn_hr_mrnng_end,
             )
             c_t = ((self.max_color_temp - self.sunrise_ct) * pct) + self.sunrise_ct
-            _LOGGER.debug(
-                "CT %s Morning %s -> Noon %s  pct: %s",
-                c_t,
-                SunSettings.gldn_hr_mrnng_end,
-                SunSettings.solar_noon,
-                pct,
-            )
+            if debug:
+                _LOGGER.debug(
+                    "CT %s Morning %s -> Noon %s  pct: %s",
+                    c_t,
+                    events.gldn_hr_mrnng_end,
+                    events.solar_noon,
+                    pct,
+                )
             return c_t, night
 
         # noon to sunset ct transistion
         # [ ]  Subprocess is tested
-        if SunSettings.solar_noon <= now < SunSettings.gldn_hr_nght_strt:
+        if events.solar_noon <= now < events.gldn_hr_nght_strt:
             # brightness transistion evening
             night = False
             pct = self.calc_pct_sqrt4(
-                SunSettings.gldn_hr_nght_strt,
+                events.gldn_hr_nght_strt,
                 now,
-                SunSettings.gldn_hr_nght_strt,
-                SunSettings.solar_noon,
+                events.gldn_hr_nght_strt,
+                events.solar_noon,
             )
             c_t = ((self.max_color_temp - self.sunset_ct) * pct) + self.sunset_ct
-            _LOGGER.debug(
-                "CT %s Noon %s -> Evening %s  pct: %s",
-                c_t,
-                SunSettings.solar_noon,
-                SunSettings.gldn_hr_nght_strt,
-                pct,
-            )
+            if debug:
+                _LOGGER.debug(
+                    "CT %s Noon %s -> Evening %s  pct: %s",
+                    c_t,
+                    events.solar_noon,
+                    events.gldn_hr_nght_strt,
+                    pct,
+                )
             return c_t, night
 
         # sunset to golden hour ct transistion
         # [ ]  Subprocess is tested
-        if SunSettings.gldn_hr_nght_strt <= now < SunSettings.gldn_hr_nght_end:
+        if events.gldn_hr_nght_strt <= now < events.gldn_hr_nght_end:
             # brightness transistion evening
             night = False
             pct = self.calc_pct_sqrt(
-                SunSettings.gldn_hr_nght_end,
+                events.gldn_hr_nght_end,
                 now,
-                SunSettings.gldn_hr_nght_end,
-                SunSettings.gldn_hr_nght_strt,
+                events.gldn_hr_nght_end,
+                events.gldn_hr_nght_strt,
             )
             c_t = ((self.sunset_ct - self.bl_hr_ct) * pct) + self.bl_hr_ct
-            _LOGGER.debug(
-                "CT %s Golden Hour %s -> Blue Hour %s  pct: %s",
-                c_t,
-                SunSettings.gldn_hr_nght_strt,
-                SunSettings.gldn_hr_nght_end,
-                pct,
-            )
+            if debug:
+                _LOGGER.debug(
+                    "CT %s Golden Hour %s -> Blue Hour %s  pct: %s",
+                    c_t,
+                    events.gldn_hr_nght_strt,
+                    events.gldn_hr_nght_end,
+                    pct,
+                )
             return c_t, night
 
         # golden hour to blue hour ct transistion
         # [ ]  Subprocess is tested
-        if SunSettings.gldn_hr_nght_end <= now < SunSettings.bl_hr_nght_end:
+        if events.gldn_hr_nght_end <= now < events.bl_hr_nght_end:
             # brightness transistion evening
             night = False
             pct = self.calc_pct_sqrt(
-                SunSettings.bl_hr_nght_end,
+                events.bl_hr_nght_end,
                 now,
-                SunSettings.bl_hr_nght_end,
-                SunSettings.gldn_hr_nght_end,
+                events.bl_hr_nght_end,
+                events.gldn_hr_nght_end,
             )
             c_t = ((self.bl_hr_ct - self.dusk_ct) * pct) + self.dusk_ct
-            _LOGGER.debug(
-                "CT %s Blue Hour %s -> Night %s  pct: %s",
-                c_t,
-                SunSettings.gldn_hr_nght_end,
-                SunSettings.bl_hr_nght_end,
-                pct,
-            )
+            if debug:
+                _LOGGER.debug(
+                    "CT %s Blue Hour %s -> Night %s  pct: %s",
+                    c_t,
+                    events.gldn_hr_nght_end,
+                    events.bl_hr_nght_end,
+                    pct,
+                )
             return c_t, night
 
         # blue hour to night ct transistion
         # [ ]  Subprocess is tested
         # TODO Needs to work with Colors, if Night Color Mode is enabled
-        if SunSettings.bl_hr_nght_end <= now < SunSettings.next_solar_midnight:
+        if events.bl_hr_nght_end <= now < events.next_solar_midnight:
             # brightness transistion evening
             night = True
             pct = self.calc_pct_sqrt6(
                 now,
-                SunSettings.bl_hr_nght_end,
-                SunSettings.next_solar_midnight,
-                SunSettings.bl_hr_nght_end,
+                events.bl_hr_nght_end,
+                events.next_solar_midnight,
+                events.bl_hr_nght_end,
             )
             c_t = ((self.min_color_temp - self.dusk_ct) * pct) + self.dusk_ct
-            _LOGGER.debug(
-                "CT %s Night %s -> Midnight %s  pct: %s",
-                c_t,
-                SunSettings.gldn_hr_nght_end,
-                SunSettings.next_solar_midnight,
-                pct,
-            )
+            if debug:
+                _LOGGER.debug(
+                    "CT %s Night %s -> Midnight %s  pct: %s",
+                    c_t,
+                    events.gldn_hr_nght_end,
+                    events.next_solar_midnight,
+                    pct,
+                )
             return c_t, night
 
-        _LOGGER.debug("CT %s Fallback to min CT %s", c_t, now)
-        return self.min_color_temp
+        if debug:
+            _LOGGER.debug("CT %s Fallback to min CT %s", self.min_color_temp, now)
+        return self.min_color_temp, False
 
     def get_settings(
-        self, is_sleep, transition
+        self, is_sleep, transition, now: Optional[datetime.datetime] = None
     ) -> dict[str, Union[float, tuple[float, float], tuple[float, float, float]]]:
-        """Get all light settings.
+        """Get all light settings at 'now', by default the current time.
 
-        Calculating all values takes <0.5ms.
+        The brightness and color temperature are interpolated from the
+        precomputed `DailyCurve` of the current day, see `get_curve`.
         """
         # NOTE Reorganize with Local TZ
-        now = dt_util.utcnow()
-        now = now.replace(tzinfo=pytz.utc)
+        if now is None:
+            now = dt_util.utcnow()
+        now = now.astimezone(pytz.utc)
 
         # now = now.replace(tzinfo=pytz.utc)
 
         # TODO add Night Color Mode
-        self.get_sun_events(now)
-        percent = SunSettings.solar_elevation
-        brightness_pct = self.calc_brightness_pct(now, is_sleep)
-        color_temp_kelvin, night = self.calc_color_temp_kelvin1(now, is_sleep)
-        color_temp_mired: float = color_temperature_kelvin_to_mired(color_temp_kelvin)
-        rgb_color: tuple[float, float, float] = color_temperature_to_rgb(
-            color_temp_kelvin
-        )
-        rgb_color = tuple(map(int, rgb_color))
+        percent = self.solar_elevation(now)
+        if is_sleep:
+            night = False
+            brightness_pct = self.sleep_brightness
+            color_temp_kelvin = self.sleep_color_temp
+            color_temp_mired = color_temperature_kelvin_to_mired(color_temp_kelvin)
+            rgb_color = tuple(map(int, color_temperature_to_rgb(color_temp_kelvin)))
+        else:
+            (
+                brightness_pct,
+                color_temp_kelvin,
+                color_temp_mired,
+                rgb_color,
+                night,
+            ) = self.get_curve(now).interpolate(now.timestamp())
         if night and self.use_night_color:
             rgb_color = eval(self.night_col)  # pylint: disable=eval-used
 
@@ -1708,15 +2942,16 @@ class SunSettings:
         # if use_night_color is None:
         #     use_night_color = self._use_night_color
 
-        _LOGGER.info(
-            "'%s': Calculating... SunPosition:'%s', Brightness:'%s', color_temp_kelvin='%s', color_temp_mired='%s', rgb_color='%s'",
-            self.name,
-            percent,
-            brightness_pct,
-            color_temp_kelvin,
-            color_temp_mired,
-            rgb_color,
-        )  # Custom,readable info log
+        if self.log.sample("settings"):
+            _LOGGER.debug(
+                "'%s': Calculating... SunPosition:'%s', Brightness:'%s', color_temp_kelvin='%s', color_temp_mired='%s', rgb_color='%s'",
+                self.name,
+                percent,
+                brightness_pct,
+                color_temp_kelvin,
+                color_temp_mired,
+                rgb_color,
+            )
 
         return {
             "brightness_pct": brightness_pct,
@@ -1731,62 +2966,614 @@ class SunSettings:
         }
 
 
+def evaluate(
+    timestamps: Sequence[float],
+    profiles: Sequence[SunSettings],
+    is_sleep: bool = False,
+) -> dict[str, Any]:
+    """Evaluate the brightness and color temperature of many profiles at once.
+
+    Returns a dict with "brightness_pct", "color_temp_kelvin" and "night",
+    each of shape (len(profiles), len(timestamps)). With NumPy these are
+    arrays that are calculated without a Python loop over the timestamps.
+    Without NumPy they are nested lists from the scalar
+    `SunSettings.calc_brightness_pct` and `SunSettings.calc_color_temp_kelvin1`.
+    The NumPy power can differ from libm in the last bit, so the results of
+    both agree to within about 1e-12 K, not bit for bit.
+    """
+    if np is None:
+        return _evaluate_python(timestamps, profiles, is_sleep)
+    timestamps = np.asarray(timestamps, dtype=float)
+    results = [_evaluate_numpy(timestamps, profile, is_sleep) for profile in profiles]
+    brightness_pct, color_temp_kelvin, night = (
+        np.array(values).reshape(len(profiles), len(timestamps))
+        for values in zip(*results)
+    )
+    return {
+        "brightness_pct": brightness_pct,
+        "color_temp_kelvin": color_temp_kelvin,
+        "night": night,
+    }
+
+
+def _evaluate_python(
+    timestamps: Sequence[float],
+    profiles: Sequence[SunSettings],
+    is_sleep: bool,
+) -> dict[str, list[list[Any]]]:
+    """Evaluate `evaluate` with the scalar `SunSettings` methods."""
+    results: dict[str, list[list[Any]]] = {
+        "brightness_pct": [],
+        "color_temp_kelvin": [],
+        "night": [],
+    }
+    for profile in profiles:
+        brightness_pct, color_temp_kelvin, night = [], [], []
+        for timestamp in timestamps:
+            events = profile.get_sun_events(
+                datetime.datetime.fromtimestamp(timestamp, pytz.utc)
+            )
+            brightness_pct.append(
+                profile.calc_brightness_pct(events, timestamp, is_sleep)
+            )
+            kelvin, is_night = profile.calc_color_temp_kelvin1(
+                events, timestamp, is_sleep
+            )
+            color_temp_kelvin.append(kelvin)
+            night.append(is_night)
+        results["brightness_pct"].append(brightness_pct)
+        results["color_temp_kelvin"].append(color_temp_kelvin)
+        results["night"].append(night)
+    return results
+
+
+def _sun_event_arrays(profile: SunSettings, now: np.ndarray) -> SunEvents:
+    """Get the `SunEvents` of every timestamp in 'now' as arrays."""
+    day = np.floor(now / 86400).astype(int)
+    unique_days, inverse = np.unique(day, return_inverse=True)
+    before_noon, after_noon = [], []
+    for unique_day in unique_days:
+        start = datetime.datetime.fromtimestamp(unique_day * 86400, pytz.utc)
+        # `get_sun_events` only depends on whether solar noon has passed
+        before_noon.append(profile.get_sun_events(start))
+        after_noon.append(
+            profile.get_sun_events(start + timedelta(days=1, microseconds=-1))
+        )
+    before_noon = np.array(before_noon)[inverse]
+    after_noon = np.array(after_noon)[inverse]
+    noon = before_noon[:, SunEvents._fields.index("solar_noon")]
+    events = np.where((noon < now)[:, np.newaxis], after_noon, before_noon)
+    return SunEvents(*events.T)
+
+
+def _evaluate_numpy(
+    now: np.ndarray, profile: SunSettings, is_sleep: bool
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Evaluate `evaluate` for a single profile with NumPy."""
+    # pylint: disable=invalid-name
+    if is_sleep:
+        return (
+            np.full(now.shape, float(profile.sleep_brightness)),
+            np.full(now.shape, float(profile.sleep_color_temp)),
+            np.zeros(now.shape, dtype=bool),
+        )
+    ev = _sun_event_arrays(profile, now)
+    p = profile
+
+    # Same segments and order as `SunSettings.calc_brightness_pct`
+    delta_brightness = p.max_brightness - p.min_brightness
+    with np.errstate(divide="ignore", invalid="ignore"):
+        brightness_pct = np.select(
+            [
+                (ev.dawn < now) & (now < ev.sunrise),
+                (ev.sunset < now) & (now < ev.dusk),
+                (ev.sunrise <= now) & (now <= ev.sunset),
+            ],
+            [
+                delta_brightness * np.power((now - ev.dawn) / (ev.sunrise - ev.dawn), 2)
+                + p.min_brightness,
+                delta_brightness * np.power((ev.dusk - now) / (ev.dusk - ev.sunset), 2)
+                + p.min_brightness,
+                p.max_brightness,
+            ],
+            p.min_brightness,
+        ).astype(float)
+
+        # Same segments and order as `SunSettings.calc_color_temp_kelvin1`
+        def _pct(val1, val2, val3, val4, power):
+            return np.abs(((val1 - val2) / (val3 - val4)) ** power)
+
+        segments = [
+            (
+                (ev.prev_solar_midnight < now) & (now < ev.next_bl_hr_mrnng_strt),
+                (p.min_color_temp - p.dawn_ct)
+                * _pct(
+                    ev.next_bl_hr_mrnng_strt,
+                    now,
+                    ev.next_bl_hr_mrnng_strt,
+                    ev.prev_solar_midnight,
+                    1 / 6,
+                )
+                + p.dawn_ct,
+                True,
+            ),
+            (
+                (ev.bl_hr_mrnng_strt <= now) & (now < ev.gldn_hr_mrnng_strt),
+                (p.bl_hr_ct - p.dawn_ct)
+                * _pct(
+                    now,
+                    ev.bl_hr_mrnng_strt,
+                    ev.gldn_hr_mrnng_strt,
+                    ev.bl_hr_mrnng_strt,
+                    1 / 2,
+                )
+                + p.dawn_ct,
+                False,
+            ),
+            (
+                (ev.gldn_hr_mrnng_strt <= now) & (now < ev.gldn_hr_mrnng_end),
+                (p.sunrise_ct - p.bl_hr_ct)
+                * _pct(
+                    now,
+                    ev.gldn_hr_mrnng_strt,
+                    ev.gldn_hr_mrnng_end,
+                    ev.gldn_hr_mrnng_strt,
+                    1 / 2,
+                )
+                + p.bl_hr_ct,
+                False,
+            ),
+            (
+                (ev.gldn_hr_mrnng_end <= now) & (now < ev.solar_noon),
+                (p.max_color_temp - p.sunrise_ct)
+                * _pct(
+                    now,
+                    ev.gldn_hr_mrnng_end,
+                    ev.solar_noon,
+                    ev.gldn_hr_mrnng_end,
+                    1 / 4,
+                )
+                + p.sunrise_ct,
+                False,
+            ),
+            (
+                (ev.solar_noon <= now) & (now < ev.gldn_hr_nght_strt),
+                (p.max_color_temp - p.sunset_ct)
+                * _pct(
+                    ev.gldn_hr_nght_strt,
+                    now,
+                    ev.gldn_hr_nght_strt,
+                    ev.solar_noon,
+                    1 / 4,
+                )
+                + p.sunset_ct,
+                False,
+            ),
+            (
+                (ev.gldn_hr_nght_strt <= now) & (now < ev.gldn_hr_nght_end),
+                (p.sunset_ct - p.bl_hr_ct)
+                * _pct(
+                    ev.gldn_hr_nght_end,
+                    now,
+                    ev.gldn_hr_nght_end,
+                    ev.gldn_hr_nght_strt,
+                    1 / 2,
+                )
+                + p.bl_hr_ct,
+                False,
+            ),
+            (
+                (ev.gldn_hr_nght_end <= now) & (now < ev.bl_hr_nght_end),
+                (p.bl_hr_ct - p.dusk_ct)
+                * _pct(
+                    ev.bl_hr_nght_end,
+                    now,
+                    ev.bl_hr_nght_end,
+                    ev.gldn_hr_nght_end,
+                    1 / 2,
+                )
+                + p.dusk_ct,
+                False,
+            ),
+            (
+                (ev.bl_hr_nght_end <= now) & (now < ev.next_solar_midnight),
+                (p.min_color_temp - p.dusk_ct)
+                * _pct(
+                    now,
+                    ev.bl_hr_nght_end,
+                    ev.next_solar_midnight,
+                    ev.bl_hr_nght_end,
+                    1 / 6,
+                )
+                + p.dusk_ct,
+                True,
+            ),
+        ]
+        conditions, color_temps, nights = zip(*segments)
+        color_temp_kelvin = np.select(conditions, color_temps, p.min_color_temp).astype(
+            float
+        )
+        night = np.select(conditions, nights, False).astype(bool)
+    return brightness_pct, color_temp_kelvin, night
+
+
+class CommandScheduler:
+    """Token bucket rate limiter for the service calls to the lights.
+
+    Shared by all switches so that their interval updates, 'apply' calls
+    and sleep mode changes together do not flood the (Zigbee/Z-Wave)
+    network. Every config entry sets its 'max_commands_per_second' and
+    'command_burst' and the strictest limits are used. A call to N lights
+    costs N tokens. With 'rate_limit_per_platform' each integration
+    platform (e.g., 'zha', 'hue') gets its own bucket.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the CommandScheduler that is shared among all switches."""
+        self.hass = hass
+        # Limits of each switch, (commands per second, burst, per platform)
+        self._limits: dict[str, tuple[float, int, bool]] = {}
+        self.rate = 0.0  # unlimited
+        self.burst = 1
+        self.per_platform = False
+        # Tokens and time of the last update of each bucket
+        self._buckets: dict[Optional[str], tuple[float, float]] = {}
+        # Makes the waiting calls take turns (first come, first served)
+        self._locks: dict[Optional[str], asyncio.Lock] = {}
+        self._platforms: dict[str, str] = {}
+
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.commands = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def set_limits(
+        self, name: str, rate: float, burst: int, per_platform: bool
+    ) -> None:
+        """Set the limits of the switch 'name', a 'rate' of 0 is unlimited."""
+        self._limits[name] = (rate, burst, per_platform)
+        self._update_limits()
+
+    def remove_limits(self, name: str) -> None:
+        """Remove the limits of the switch 'name'."""
+        self._limits.pop(name, None)
+        self._update_limits()
+
+    def _update_limits(self) -> None:
+        limits = [limit for limit in self._limits.values() if limit[0] > 0]
+        self.rate = min((rate for rate, _, _ in limits), default=0.0)
+        self.burst = min((burst for _, burst, _ in limits), default=1)
+        self.per_platform = any(per_platform for _, _, per_platform in limits)
+
+    def _platform(self, entity_id: str) -> str:
+        platform = self._platforms.get(entity_id)
+        if platform is None:
+            entry = entity_registry.async_get(self.hass).async_get(entity_id)
+            platform = self._platforms[entity_id] = entry.platform if entry else ""
+        return platform
+
+    async def _acquire(self, bucket: Optional[str], cost: int) -> None:
+        """Wait until 'cost' tokens are in 'bucket' and take them.
+
+        The cost is capped at 'burst' (the size of the bucket), which another
+        switch can lower while this call waits.
+        """
+        start = time.monotonic()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            lock = self._locks.get(bucket)
+            if lock is None:
+                lock = self._locks[bucket] = asyncio.Lock()
+            async with lock:
+                while self.rate:
+                    now = time.monotonic()
+                    tokens, updated = self._buckets.get(bucket, (self.burst, now))
+                    tokens = min(self.burst, tokens + (now - updated) * self.rate)
+                    needed = min(cost, self.burst)
+                    if tokens >= needed:
+                        self._buckets[bucket] = (tokens - needed, now)
+                        break
+                    self._buckets[bucket] = (tokens, now)
+                    await asyncio.sleep((needed - tokens) / self.rate)
+        finally:
+            self.queue_depth -= 1
+        wait = time.monotonic() - start
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    async def async_call(
+        self,
+        domain: str,
+        service: str,
+        service_data: dict[str, Any],
+        context: Optional[Context] = None,
+    ) -> None:
+        """Call a service on the lights in 'service_data' within the limits.
+
+        Every service call counts as one command, also every chunk of a batch.
+        """
+        if not self.rate:
+            self.commands += 1
+            await self.hass.services.async_call(
+                domain, service, service_data, context=context
+            )
+            return
+
+        entity_ids = cv.ensure_list(service_data[ATTR_ENTITY_ID])
+        buckets: dict[Optional[str], list[str]] = defaultdict(list)
+        for entity_id in entity_ids:
+            bucket = self._platform(entity_id) if self.per_platform else None
+            buckets[bucket].append(entity_id)
+
+        async def call(bucket: Optional[str], entity_ids: list[str]) -> None:
+            # A bucket never holds more than 'burst' tokens, so a larger batch
+            # is sent in chunks that each pay for their lights
+            burst = self.burst
+            for start in range(0, len(entity_ids), burst):
+                chunk = entity_ids[start : start + burst]
+                await self._acquire(bucket, len(chunk))
+                data = service_data
+                if len(buckets) > 1 or len(chunk) < len(entity_ids):
+                    data = {**service_data, ATTR_ENTITY_ID: chunk}
+                self.commands += 1
+                await self.hass.services.async_call(
+                    domain, service, data, context=context
+                )
+
+        await asyncio.gather(
+            *(call(bucket, entity_ids) for bucket, entity_ids in buckets.items())
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the limits and the queue and wait time statistics."""
+        return {
+            "max_commands_per_second": self.rate,
+            "command_burst": self.burst,
+            "per_platform": self.per_platform,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "commands": self.commands,
+            "mean_wait": round(self.total_wait / max(self.commands, 1), 3),
+            "max_wait": round(self.max_wait, 3),
+        }
+
+
+class TraceEntry(NamedTuple):
+    """A decision of a switch to adapt a light or not, see `_LightRecord.trace`."""
+
+    time: float  # 'time.time()'
+    switch: str
+    trigger: Optional[str]  # e.g., 'interval', 'light_event' or 'service'
+    decision: str  # 'sent', 'failed' or why it is skipped, e.g., 'deadband'
+    brightness: Optional[int] = None
+    color_temp: Optional[int] = None
+    rgb_color: Optional[tuple[int, int, int]] = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the entry with a readable time."""
+        time_fired = dt_util.utc_from_timestamp(self.time)
+        return dict(self._asdict(), time=time_fired.isoformat())
+
+
+class _LightRecord:
+    """Everything that is tracked about a single light, see `TurnOnOffListener`."""
+
+    __slots__ = (
+        "turn_off_event",
+        "turn_on_event",
+        "on_to_off_event",
+        "off_to_on_event",
+        "sleep_task",
+        "manual_control",
+        "cnt_significant_changes",
+        "last_state_change",
+        "last_service_data",
+        "last_polled",
+        "last_reported",
+        "poll",
+        "trace",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the record of a light that has not been seen yet."""
+        # Last 'light.turn_off' and 'light.turn_on' service calls
+        self.turn_off_event: Optional[Event] = None
+        self.turn_on_event: Optional[Event] = None
+        # Last 'on' → 'off' and 'off' → 'on' state changes
+        self.on_to_off_event: Optional[Event] = None
+        self.off_to_on_event: Optional[Event] = None
+        # 'asyncio.sleep' task that can be cancelled by a 'light.turn_on' event
+        self.sleep_task: Optional[asyncio.Task] = None
+        self.manual_control = False
+        # Number of times (in a row) the light had a changed state
+        self.cnt_significant_changes = 0
+        # 'state_changed' events resulting from this integration, at most
+        # MAX_STATE_CHANGES of them with the same context
+        self.last_state_change: Optional[list[State]] = None
+        # Last 'service_data' to 'light.turn_on' resulting from this integration
+        self.last_service_data: Optional[dict[str, Any]] = None
+        # When the light was last polled and when it last reported a state
+        # ('time.monotonic'), and the running poll
+        self.last_polled = -math.inf
+        self.last_reported = -math.inf
+        self.poll: Optional[asyncio.Task] = None
+        # The last TRACE_SIZE adaptation decisions, always on
+        self.trace: deque[TraceEntry] = deque(maxlen=TRACE_SIZE)
+
+
 class TurnOnOffListener:
     """Track 'light.turn_off' and 'light.turn_on' service calls."""
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the TurnOnOffListener that is shared among all switches."""
         self.hass = hass
-        self.lights = set()
-
-        # Tracks 'light.turn_off' service calls
-        self.turn_off_event: dict[str, Event] = {}
-        # Tracks 'light.turn_on' service calls
-        self.turn_on_event: dict[str, Event] = {}
-        # Keep 'asyncio.sleep' tasks that can be cancelled by 'light.turn_on' events
-        self.sleep_tasks: dict[str, asyncio.Task] = {}
-        # Tracks which lights are manually controlled
-        self.manual_control: dict[str, bool] = {}
-        # Counts the number of times (in a row) a light had a changed state.
-        self.cnt_significant_changes: dict[str, int] = defaultdict(int)
-        # Track 'state_changed' events of self.lights resulting from this integration
-        self.last_state_change: dict[str, list[State]] = {}
-        # Track last 'service_data' to 'light.turn_on' resulting from this integration
-        self.last_service_data: dict[str, dict[str, Any]] = {}
+        # Use `add_lights` and `discard_lights` to change, they update the listeners
+        self.lights: set[str] = set()
+
+        # What is tracked per light, removed when a light leaves all switches
+        self.records: dict[str, _LightRecord] = {}
+        # Switches that contain a light, in the order in which they claimed it
+        self.owners: dict[str, list[ArtifSunSwitch]] = {}
+        # The switch and reason of the recently created contexts, see `ContextFactory`
+        self.contexts: OrderedDict[str, tuple[ArtifSunSwitch, str]] = OrderedDict()
 
         # When a state is different `max_cnt_significant_changes` times in a row,
         # mark it as manually_controlled.
         self.max_cnt_significant_changes = 2
+        # Samples the debug messages of the state changes, per light
+        self.log = SampledLog()
 
         self.remove_listener = self.hass.bus.async_listen(
-            EVENT_CALL_SERVICE, self.turn_on_off_event_listener
-        )
-        self.remove_listener2 = self.hass.bus.async_listen(
-            EVENT_STATE_CHANGED, self.state_changed_event_listener
+            EVENT_CALL_SERVICE,
+            self.turn_on_off_event_listener,
+            event_filter=self._is_tracked_service_call,
         )
+        self._remove_state_listener: Optional[CALLBACK_TYPE] = None
+
+    def add_lights(self, *lights: str) -> None:
+        """Start tracking the service calls and state changes of 'lights'."""
+        if not self.lights.issuperset(lights):
+            self.lights.update(lights)
+            self._track_lights()
+
+    def discard_lights(self, *lights: str) -> None:
+        """Stop tracking the service calls and state changes of 'lights'."""
+        for light in lights:
+            record = self.records.pop(light, None)
+            if record is not None and record.sleep_task is not None:
+                record.sleep_task.cancel()
+            self.log.forget(light)
+        if not self.lights.isdisjoint(lights):
+            self.lights.difference_update(lights)
+            self._track_lights()
+
+    def discard_unowned(self, *lights: str) -> None:
+        """Stop tracking the 'lights' that are in no switch."""
+        self.discard_lights(*(light for light in lights if light not in self.owners))
+
+    def record(self, light: str) -> _LightRecord:
+        """Get the record of 'light', creating it if needed."""
+        record = self.records.get(light)
+        if record is None:
+            record = self.records[light] = _LightRecord()
+        return record
+
+    def claim_lights(self, switch: ArtifSunSwitch, lights: Sequence[str]) -> None:
+        """Make 'switch' one of the owners of 'lights' (and no other lights)."""
+        lights = set(lights)
+        for light, owners in list(self.owners.items()):
+            if switch in owners and light not in lights:
+                owners.remove(switch)
+                if not owners:
+                    del self.owners[light]
+                    self.discard_lights(light)
+        for light in lights:
+            owners = self.owners.setdefault(light, [])
+            if switch not in owners:
+                owners.append(switch)
+        self.add_lights(*lights)
+
+    def release_lights(self, switch: ArtifSunSwitch) -> None:
+        """Remove 'switch' from the owners of all lights."""
+        self.claim_lights(switch, ())
+
+    def owner(self, light: str) -> Optional[ArtifSunSwitch]:
+        """Get the switch that adapts 'light' when it is in several profiles.
+
+        That is the switch with the highest priority among the switches that
+        are on, or the switch that claimed the light first on a tie.
+        """
+        owners = self.owners.get(light)
+        if not owners:
+            return None
+        if len(owners) == 1:
+            return owners[0]
+        candidates = [switch for switch in owners if switch.is_on] or owners
+        return max(candidates, key=lambda switch: switch.priority)
+
+    def attribute(
+        self, context: Optional[Context]
+    ) -> Optional[tuple[ArtifSunSwitch, str]]:
+        """Get the switch and reason that created 'context', None if unknown."""
+        if context is None:
+            return None
+        return self.contexts.get(context.id)
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the sizes of what is tracked, to spot leaks."""
+        records = self.records.values()
+        return {
+            "lights": len(self.lights),
+            "records": len(self.records),
+            "owners": len(self.owners),
+            "contexts": len(self.contexts),
+            "suppressed_log_messages": self.log.suppressed,
+            "manual_control": sum(record.manual_control for record in records),
+            "pending_sleep_tasks": sum(
+                record.sleep_task is not None and not record.sleep_task.done()
+                for record in records
+            ),
+            "running_polls": sum(record.poll is not None for record in records),
+            "stored_states": sum(
+                len(record.last_state_change or ()) for record in records
+            ),
+            "stored_service_data": sum(
+                record.last_service_data is not None for record in records
+            ),
+        }
+
+    def remove_listeners(self) -> None:
+        """Remove all listeners from Home Assistant."""
+        self.remove_listener()
+        if self._remove_state_listener is not None:
+            self._remove_state_listener()
+            self._remove_state_listener = None
+
+    def _track_lights(self) -> None:
+        # One tracker per set of lights, events of other entities are
+        # dispatched by Home Assistant without calling us at all
+        if self._remove_state_listener is not None:
+            self._remove_state_listener()
+            self._remove_state_listener = None
+        if self.lights:
+            self._remove_state_listener = async_track_state_change_event(
+                self.hass, list(self.lights), self.state_changed_event_listener
+            )
+
+    @callback
+    def _is_tracked_service_call(self, event: Event) -> bool:
+        """Filter 'call_service' events before a listener job is scheduled."""
+        data = event.data
+        if data.get(ATTR_DOMAIN) != LIGHT_DOMAIN:
+            return False
+        if data.get(ATTR_SERVICE) not in (SERVICE_TURN_ON, SERVICE_TURN_OFF):
+            return False
+        entity_ids = data.get(ATTR_SERVICE_DATA, {}).get(ATTR_ENTITY_ID)
+        if entity_ids is None:
+            return False
+        return not self.lights.isdisjoint(cv.ensure_list_csv(entity_ids))
 
     def reset(self, *lights, reset_manual_control=True) -> None:
         """Reset the 'manual_control' status of the lights."""
         for light in lights:
+            record = self.records.get(light)
+            if record is None:
+                continue
             if reset_manual_control:
-                self.manual_control[light] = False
-            self.last_state_change.pop(light, None)
-            self.last_service_data.pop(light, None)
-            self.cnt_significant_changes[light] = 0
+                record.manual_control = False
+            record.last_state_change = None
+            record.last_service_data = None
+            record.cnt_significant_changes = 0
 
-    async def turn_on_off_event_listener(self, event: Event) -> None:
+    @callback
+    def turn_on_off_event_listener(self, event: Event) -> None:
         """Track 'light.turn_off' and 'light.turn_on' service calls."""
-        domain = event.data.get(ATTR_DOMAIN)
-        if domain != LIGHT_DOMAIN:
-            return
-
         service = event.data[ATTR_SERVICE]
         service_data = event.data[ATTR_SERVICE_DATA]
         entity_ids = cv.ensure_list_csv(service_data[ATTR_ENTITY_ID])
 
-        if not any(eid in self.lights for eid in entity_ids):
-            return
-
         if service == SERVICE_TURN_OFF:
             transition = service_data.get(ATTR_TRANSITION)
             _LOGGER.debug(
@@ -1796,8 +3583,9 @@ class TurnOnOffListener:
                 event.context.id,
             )
             for eid in entity_ids:
-                self.turn_off_event[eid] = event
-                self.reset(eid)
+                if eid in self.lights:
+                    self.record(eid).turn_off_event = event
+                    self.reset(eid)
 
         elif service == SERVICE_TURN_ON:
             # _LOGGER.debug(
@@ -1806,27 +3594,41 @@ class TurnOnOffListener:
             #     event.context.id,
             # )
             for eid in entity_ids:
-                task = self.sleep_tasks.get(eid)
-                if task is not None:
-                    task.cancel()
-                self.turn_on_event[eid] = event
-
-    async def state_changed_event_listener(self, event: Event) -> None:
-        """Track 'state_changed' events."""
-        entity_id = event.data.get(ATTR_ENTITY_ID, "")
-        if entity_id not in self.lights or entity_id.split(".")[0] != LIGHT_DOMAIN:
+                if eid not in self.lights:
+                    continue
+                record = self.record(eid)
+                if record.sleep_task is not None:
+                    record.sleep_task.cancel()
+                record.turn_on_event = event
+
+    @callback
+    def state_changed_event_listener(self, event: Event) -> None:
+        """Track 'state_changed' events of the lights."""
+        entity_id = event.data[ATTR_ENTITY_ID]
+        if entity_id.split(".")[0] != LIGHT_DOMAIN:
             return
+        if entity_id in self.lights:
+            self.record(entity_id).last_reported = time.monotonic()
 
         new_state = event.data.get("new_state")
         if new_state is not None and new_state.state == STATE_ON:
-            _LOGGER.debug(
-                "External Light change Event: '%s'  event: '%s' with context.id='%s'",
-                entity_id,
-                new_state.attributes,
-                new_state.context.id,
-            )
+            if self.log.sample(entity_id):
+                _LOGGER.debug(
+                    "External Light change Event: '%s'  event: '%s' with context.id='%s'",
+                    entity_id,
+                    new_state.attributes,
+                    new_state.context.id,
+                )
 
             if is_our_context(new_state.context):
+                attribution = self.attribute(new_state.context)
+                if attribution is not None:
+                    _LOGGER.debug(
+                        "State change of '%s' results from the '%s' of %s",
+                        entity_id,
+                        attribution[1],
+                        attribution[0].name,
+                    )
                 # It is possible to have multiple state change events with the same context.
                 # This can happen because a `turn_on.light(brightness_pct=100, transition=30)`
                 # event leads to an instant state change of
@@ -1838,7 +3640,8 @@ class TurnOnOffListener:
                 # called with a color_temp outside of its range (and HA reports the
                 # incorrect 'min_mireds' and 'max_mireds', which happens e.g., for
                 # Philips Hue White GU10 Bluetooth lights).
-                old_state: Optional[list[State]] = self.last_state_change.get(entity_id)
+                record = self.record(entity_id)
+                old_state: Optional[list[State]] = record.last_state_change
                 if (
                     old_state is not None
                     and old_state[0].context.id == new_state.context.id
@@ -1846,14 +3649,17 @@ class TurnOnOffListener:
                     # If there is already a state change event from this event (with this
                     # context) then append it to the already existing list.
                     _LOGGER.debug(
-                        "State change event of '%s' is already in 'self.last_state_change' (%s)"
+                        "State change event of '%s' is already in 'last_state_change' (%s)"
                         " adding this state also",
                         entity_id,
                         new_state.context.id,
                     )
-                    self.last_state_change[entity_id].append(new_state)
+                    if len(old_state) < MAX_STATE_CHANGES:
+                        old_state.append(new_state)
+                    else:  # keep the first ones and the latest
+                        old_state[-1] = new_state
                 else:
-                    self.last_state_change[entity_id] = [new_state]
+                    record.last_state_change = [new_state]
 
     def is_manually_controlled(
         self,
@@ -1864,12 +3670,13 @@ class TurnOnOffListener:
         adapt_color: bool,
     ) -> bool:
         """Check if the light has been 'on' and is now manually controlled."""
-        manual_control = self.manual_control.setdefault(light, False)
+        record = self.record(light)
+        manual_control = record.manual_control
         if manual_control:
             # Manually controlled until light is turned on and off
             return True
 
-        turn_on_event = self.turn_on_event.get(light)
+        turn_on_event = record.turn_on_event
         if (
             turn_on_event is not None
             and not is_our_context(turn_on_event.context)
@@ -1881,7 +3688,7 @@ class TurnOnOffListener:
             ):
                 # Light was already on and 'light.turn_on' was not called by
                 # the artificial_sunlight integration.
-                manual_control = self.manual_control[light] = True
+                manual_control = record.manual_control = True
                 _fire_manual_control_event(switch, light, turn_on_event.context)
                 _LOGGER.debug(
                     "'%s' was already on and 'light.turn_on' was not called by the"
@@ -1900,18 +3707,22 @@ class TurnOnOffListener:
         adapt_brightness: bool,
         adapt_color: bool,
         context: Context,
+        poll: bool = True,
     ) -> bool:
         """Has the light made a significant change since last update.
 
         This method will detect changes that were made to the light without
         calling 'light.turn_on', so outside of Home Assistant. If a change is
         detected, we mark the light as 'manually controlled' until the light
-        or switch is turned 'off' and 'on' again.
+        or switch is turned 'off' and 'on' again. Without 'poll', the last
+        reported state of the light is used.
         """
-        if light not in self.last_state_change:
+        record = self.records.get(light)
+        if record is None or record.last_state_change is None:
             return False
-        old_states: list[State] = self.last_state_change[light]
-        await self.hass.helpers.entity_component.async_update_entity(light)
+        old_states: list[State] = record.last_state_change
+        if poll:
+            await self.update_light(light)
         new_state = self.hass.states.get(light)
         compare_to = functools.partial(
             _attributes_have_changed,
@@ -1932,7 +3743,7 @@ class TurnOnOffListener:
                 )
                 break
 
-        last_service_data = self.last_service_data.get(light)
+        last_service_data = record.last_service_data
         if changed and last_service_data is not None:
             # It can happen that the state change events that are associated
             # with the last 'light.turn_on' call by this integration were not
@@ -1946,14 +3757,14 @@ class TurnOnOffListener:
                     context.id,
                 )
 
-        n_changes = self.cnt_significant_changes[light]
+        n_changes = record.cnt_significant_changes
         if changed:
-            self.cnt_significant_changes[light] += 1
+            record.cnt_significant_changes += 1
             if n_changes >= self.max_cnt_significant_changes:
                 # Only mark a light as significantly changing, if changed==True
                 # N times in a row. We do this because sometimes a state changes
                 # happens only *after* a new update interval has already started.
-                self.manual_control[light] = True
+                record.manual_control = True
                 _fire_manual_control_event(switch, light, context, is_async=False)
         else:
             if n_changes > 1:
@@ -1963,10 +3774,63 @@ class TurnOnOffListener:
                     light,
                     n_changes,
                 )
-            self.cnt_significant_changes[light] = 0
+            record.cnt_significant_changes = 0
 
         return changed
 
+    def lights_to_poll(
+        self, lights: list[str], budget: int, max_state_age: int
+    ) -> set[str]:
+        """Select the lights that 'significant_change' should poll.
+
+        Lights with a reported or polled state that is at most 'max_state_age'
+        seconds old are skipped. Of the others, at most 'budget' are selected
+        (0 is unlimited), those that were polled longest ago first. Lights
+        that are being polled already are always included, they share the poll.
+        """
+        now = time.monotonic()
+        utcnow = dt_util.utcnow()
+        polling = set()
+        stale = []
+        for light in lights:
+            record = self.records.get(light)
+            if record is None or record.last_state_change is None:
+                continue  # nothing to compare to
+            if record.poll is not None:
+                polling.add(light)
+                continue
+            last_polled = record.last_polled
+            if max_state_age:
+                age = now - max(last_polled, record.last_reported)
+                state = self.hass.states.get(light)
+                # Since Home Assistant 2024.3, also set when the reported
+                # state is unchanged, which fires no 'state_changed' event
+                last_reported = getattr(state, "last_reported", None)
+                if last_reported is not None:
+                    age = min(age, (utcnow - last_reported).total_seconds())
+                if age <= max_state_age:
+                    continue
+            stale.append((last_polled, light))
+        stale.sort()
+        if budget:
+            stale = stale[:budget]
+        return polling.union(light for _, light in stale)
+
+    async def update_light(self, light: str) -> None:
+        """Poll 'light', or wait for the poll that is already running."""
+        record = self.record(light)
+        if record.poll is None:
+            record.poll = self.hass.async_create_task(self._poll(light, record))
+        # Shielded, a cancelled caller should not cancel the poll of the others
+        await asyncio.shield(record.poll)
+
+    async def _poll(self, light: str, record: _LightRecord) -> None:
+        try:
+            await self.hass.helpers.entity_component.async_update_entity(light)
+        finally:
+            record.last_polled = time.monotonic()
+            record.poll = None
+
     async def maybe_cancel_adjusting(
         self, entity_id: str, off_to_on_event: Event, on_to_off_event: Optional[Event]
     ) -> bool:
@@ -1988,13 +3852,14 @@ class TurnOnOffListener:
 
         id_on_to_off = on_to_off_event.context.id
 
-        turn_off_event = self.turn_off_event.get(entity_id)
+        record = self.record(entity_id)
+        turn_off_event = record.turn_off_event
         if turn_off_event is not None:
             transition = turn_off_event.data[ATTR_SERVICE_DATA].get(ATTR_TRANSITION)
         else:
             transition = None
 
-        turn_on_event = self.turn_on_event.get(entity_id)
+        turn_on_event = record.turn_on_event
         id_turn_on = turn_on_event.context.id
 
         id_off_to_on = off_to_on_event.context.id
@@ -2033,7 +3898,7 @@ class TurnOnOffListener:
             # It can happen that the actual transition time is longer than the
             # specified time in the 'turn_off' service.
             coro = asyncio.sleep(delay)
-            task = self.sleep_tasks[entity_id] = asyncio.ensure_future(coro)
+            task = record.sleep_task = asyncio.ensure_future(coro)
             try:
                 await task
             except asyncio.CancelledError:  # 'light.turn_on' has been called
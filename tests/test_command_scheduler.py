@@ -0,0 +1,93 @@
+# pylint: disable=protected-access
+"""Tests of the rate limiting of the `CommandScheduler`."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.artificial_sunlight import switch
+from custom_components.artificial_sunlight.const import ATTR_COMMAND_SCHEDULER, DOMAIN
+
+from benchmarks.helpers import make_lights
+
+RATE, BURST = 50.0, 5
+
+
+class FakeClock:
+    """Replace the clock and 'asyncio.sleep' so waiting takes no real time."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+        self._sleep = asyncio.sleep
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+        await self._sleep(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Make the `CommandScheduler` wait on a fake clock."""
+    clock = FakeClock()
+    monkeypatch.setattr(switch, "time", SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(switch.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+@pytest.fixture
+def scheduler(hass):
+    """Get the `CommandScheduler`, limited to RATE commands/s and BURST."""
+    scheduler = hass.data[DOMAIN][ATTR_COMMAND_SCHEDULER]
+    scheduler.set_limits("test", RATE, BURST, False)
+    return scheduler
+
+
+def turn_on(hass, scheduler, lights):
+    """Call 'light.turn_on' on 'lights' through 'scheduler'."""
+    call = scheduler.async_call("light", "turn_on", {"entity_id": lights})
+    hass.loop.run_until_complete(asyncio.wait_for(call, timeout=5))
+
+
+def test_batch_larger_than_burst_is_sent_in_chunks(hass, clock, scheduler):
+    lights = make_lights(hass, 3 * BURST)
+    turn_on(hass, scheduler, lights)
+
+    assert [call[2]["entity_id"] for call in hass.services.calls] == [
+        lights[index : index + BURST] for index in range(0, len(lights), BURST)
+    ]
+    # The first chunk uses the full bucket, the other two wait for a refill
+    assert clock.now == pytest.approx(2 * BURST / RATE)
+    assert scheduler.commands == 3
+
+
+def test_unlimited_counts_a_command_per_call(hass, clock, scheduler):
+    scheduler.remove_limits("test")
+    turn_on(hass, scheduler, make_lights(hass, 3 * BURST))
+
+    assert len(hass.services.calls) == 1
+    assert scheduler.commands == 1
+    assert not clock.sleeps
+
+
+def test_lowered_burst_does_not_hang(hass, clock, scheduler, monkeypatch):
+    lights = make_lights(hass, BURST)
+    turn_on(hass, scheduler, lights)  # Empties the bucket
+
+    async def lower_burst(delay: float) -> None:
+        # Another switch lowers the burst while this call waits
+        scheduler.set_limits("other", RATE, 2, False)
+        await FakeClock.sleep(clock, delay)
+
+    monkeypatch.setattr(switch.asyncio, "sleep", lower_burst)
+    turn_on(hass, scheduler, lights)
+
+    assert len(hass.services.calls) == 2
+    assert scheduler.burst == 2
@@ -0,0 +1,84 @@
+# pylint: disable=protected-access
+"""Tests of the `DailyCurve` of `SunSettings.get_curve`."""
+
+from __future__ import annotations
+
+import datetime
+import statistics
+import zoneinfo
+
+import pytest
+
+from custom_components.artificial_sunlight import switch
+
+from benchmarks.helpers import NOW, make_lights, make_switch
+
+# Away from the sun events at which a segment starts, the linear interpolation
+# of the samples is off by at most this many %-points of brightness, and on
+# average this many mired (right after a kink, e.g., at the end of the golden
+# hour, it can be off by up to MAX_MIRED_ERROR mired for a minute)
+BRIGHTNESS_ERROR, MEAN_MIRED_ERROR, MAX_MIRED_ERROR = 0.02, 0.1, 15
+SAMPLE_STEP = 7  # seconds, not a divisor of the curve resolution
+
+
+def sun_settings(hass, time_zone):
+    """Get the `SunSettings` of a switch in 'time_zone'."""
+    hass.config.time_zone = time_zone
+    return make_switch(hass, make_lights(hass, 1))._sun_light_settings
+
+
+@pytest.mark.parametrize("time_zone", ("UTC", "America/New_York", "Asia/Tokyo"))
+@pytest.mark.parametrize("hours", (-10, 0, 10))
+def test_curve_covers_the_local_day(hass, time_zone, hours):
+    now = NOW + datetime.timedelta(hours=hours)
+    local_now = now.astimezone(zoneinfo.ZoneInfo(time_zone))
+
+    curve = sun_settings(hass, time_zone).get_curve(now)
+
+    assert curve.date == local_now.date()
+    midnight = local_now.replace(hour=0, minute=0, second=0)
+    assert curve.start == midnight.timestamp()
+    assert curve.start <= now.timestamp() < curve.start + 24 * 3600
+
+
+@pytest.mark.parametrize(
+    "date, hours",
+    ((datetime.date(2021, 3, 28), 23), (datetime.date(2021, 10, 31), 25)),
+)
+def test_curve_of_a_dst_change(hass, date, hours):
+    now = datetime.datetime.combine(date, datetime.time(12), datetime.timezone.utc)
+    curve = sun_settings(hass, "Europe/Amsterdam").get_curve(now)
+
+    assert len(curve.night) == hours * 60 + 1
+
+
+@pytest.mark.parametrize("time_zone", ("UTC", "America/New_York"))
+def test_curve_is_accurate(hass, time_zone):
+    settings = sun_settings(hass, time_zone)
+    curve = settings.get_curve(NOW)
+    # The local day can span two UTC days
+    boundaries = []
+    for moment in (curve.start, curve.start + 86399):
+        events = settings.get_sun_events(switch.dt_util.utc_from_timestamp(moment))
+        boundaries.extend(getattr(events, name) for name in switch._SEGMENT_BOUNDARIES)
+
+    def near_a_boundary(timestamp):
+        start = curve.start + (timestamp - curve.start) // curve.step * curve.step
+        return any(start <= boundary <= start + curve.step for boundary in boundaries)
+
+    timestamps = [
+        timestamp
+        for timestamp in range(int(curve.start), int(curve.start) + 86400, SAMPLE_STEP)
+        if not near_a_boundary(timestamp)
+    ]
+    exact = switch.evaluate(timestamps, [settings])
+
+    mired_errors = []
+    for timestamp, brightness, kelvin in zip(
+        timestamps, exact["brightness_pct"][0], exact["color_temp_kelvin"][0]
+    ):
+        curve_brightness, curve_kelvin, *_ = curve.interpolate(timestamp)
+        assert curve_brightness == pytest.approx(brightness, abs=BRIGHTNESS_ERROR)
+        mired_errors.append(abs(1e6 / curve_kelvin - 1e6 / kelvin))
+    assert statistics.mean(mired_errors) < MEAN_MIRED_ERROR
+    assert max(mired_errors) < MAX_MIRED_ERROR
@@ -0,0 +1,58 @@
+# pylint: disable=protected-access
+"""Tests of the NumPy and the pure-Python paths of `evaluate`."""
+
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+from custom_components.artificial_sunlight import switch
+from custom_components.artificial_sunlight.const import (
+    CONF_LANDSCAPE_HORIZON,
+    CONF_MAX_COLOR_TEMP,
+    CONF_MIN_BRIGHTNESS,
+    CONF_MIN_COLOR_TEMP,
+    CONF_SUNRISE_OFFSET,
+    CONF_SUNSET_OFFSET,
+    CONF_TWILIGHT_STAGE,
+)
+
+from benchmarks.helpers import NOW, make_lights, make_switch
+
+pytest.importorskip("numpy")
+
+# The NumPy power can differ from libm in the last bit of a float
+TOLERANCE = 1e-10
+
+PROFILES = (
+    {},
+    {CONF_MIN_COLOR_TEMP: 2500, CONF_MAX_COLOR_TEMP: 6000, CONF_MIN_BRIGHTNESS: 20},
+    {CONF_SUNRISE_OFFSET: 1800, CONF_SUNSET_OFFSET: -3600},
+    {CONF_LANDSCAPE_HORIZON: 5, CONF_TWILIGHT_STAGE: 12},
+)
+
+# Every minute of a whole day
+START = datetime.datetime.combine(NOW.date(), datetime.time(), NOW.tzinfo)
+TIMESTAMPS = [START.timestamp() + 60 * minute for minute in range(24 * 60 + 1)]
+
+
+@pytest.fixture
+def profiles(hass):
+    """Create the `SunSettings` of switches with different options."""
+    lights = make_lights(hass, 1)
+    switches = [make_switch(hass, lights, **options) for options in PROFILES]
+    return [sw._sun_light_settings for sw in switches]
+
+
+@pytest.mark.parametrize("is_sleep", (False, True))
+def test_numpy_and_python_agree(profiles, monkeypatch, is_sleep):
+    with_numpy = switch.evaluate(TIMESTAMPS, profiles, is_sleep)
+    monkeypatch.setattr(switch, "np", None)
+    without_numpy = switch.evaluate(TIMESTAMPS, profiles, is_sleep)
+
+    for key in ("brightness_pct", "color_temp_kelvin"):
+        for row, expected in zip(with_numpy[key], without_numpy[key]):
+            assert list(row) == pytest.approx(expected, rel=0, abs=TOLERANCE)
+    for row, expected in zip(with_numpy["night"], without_numpy["night"]):
+        assert list(map(bool, row)) == expected
@@ -0,0 +1,93 @@
+# pylint: disable=protected-access
+"""Tests of the `LightGroupIndex` that expands (nested) light groups."""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from custom_components.artificial_sunlight.const import (
+    ATTR_LIGHT_GROUPS,
+    ATTR_TURN_ON_OFF_LISTENER,
+    DOMAIN,
+)
+
+from benchmarks.helpers import make_lights, make_switch
+
+
+@pytest.fixture
+def groups(hass):
+    """Get the shared `LightGroupIndex`."""
+    return hass.data[DOMAIN][ATTR_LIGHT_GROUPS]
+
+
+def set_group(hass, group, members):
+    """Create or change the light group 'group'."""
+    hass.states.async_set(group, "on", {"entity_id": members})
+
+
+def test_nested_groups_are_expanded(hass, groups):
+    lights = make_lights(hass, 3)
+    set_group(hass, "light.inner", lights[1:])
+    set_group(hass, "light.outer", [lights[0], "light.inner", lights[2]])
+
+    assert groups.expand(["light.outer"]) == lights
+    assert groups.expand([lights[2], "light.inner"]) == [lights[2], lights[1]]
+
+
+def test_cyclic_groups_are_ignored(hass, groups, caplog):
+    lights = make_lights(hass, 2)
+    set_group(hass, "light.first", [lights[0], "light.second"])
+    set_group(hass, "light.second", ["light.first", lights[1]])
+
+    with caplog.at_level(logging.WARNING):
+        assert groups.expand(["light.first"]) == lights
+    assert "contains itself" in caplog.text
+
+
+def test_membership_changes_are_tracked(hass, groups):
+    lights = make_lights(hass, 3)
+    set_group(hass, "light.inner", lights[:1])
+    set_group(hass, "light.outer", ["light.inner"])
+    assert groups.expand(["light.outer"]) == lights[:1]
+    changes = []
+    groups.async_add_listener(changes.append)
+
+    set_group(hass, "light.inner", lights[1:])
+
+    assert changes == [{"light.inner", "light.outer"}]
+    assert groups.expand(["light.outer"]) == lights[1:]
+    # Only the state of the group changes
+    hass.states.async_set("light.inner", "off", {"entity_id": lights[1:]})
+    assert len(changes) == 1
+
+
+def test_missing_entity_can_become_a_group(hass, groups):
+    lights = make_lights(hass, 2)
+    assert groups.expand(["light.later"]) == ["light.later"]
+    changes = []
+    groups.async_add_listener(changes.append)
+
+    set_group(hass, "light.later", lights)
+
+    assert changes == [{"light.later"}]
+    assert groups.expand(["light.later"]) == lights
+
+
+def test_added_lights_are_reset(hass, groups):
+    listener = hass.data[DOMAIN][ATTR_TURN_ON_OFF_LISTENER]
+    lights = make_lights(hass, 2)
+    set_group(hass, "light.group", lights[:1])
+    switch = make_switch(hass, ["light.group"])
+    groups.async_add_listener(switch._light_groups_changed)
+    # E.g., left over from another switch
+    record = listener.record(lights[1])
+    record.manual_control = True
+    record.last_service_data = {"entity_id": lights[1], "brightness": 1}
+
+    set_group(hass, "light.group", lights)
+
+    assert switch._lights == lights
+    assert not record.manual_control
+    assert record.last_service_data is None
@@ -0,0 +1,81 @@
+# pylint: disable=protected-access
+"""Tests of which switch adapts a light that is in several switches."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.artificial_sunlight.const import (
+    ATTR_TURN_ON_OFF_LISTENER,
+    CONF_PRIORITY,
+    DOMAIN,
+)
+
+from benchmarks.helpers import make_lights, make_switch
+
+
+@pytest.fixture
+def listener(hass):
+    """Get the shared `TurnOnOffListener`."""
+    return hass.data[DOMAIN][ATTR_TURN_ON_OFF_LISTENER]
+
+
+@pytest.fixture
+def light(hass):
+    """Add a light."""
+    return make_lights(hass, 1)[0]
+
+
+def adapt(hass, switch):
+    """Run a forced adaptation pass of 'switch'."""
+    hass.loop.run_until_complete(
+        switch._update_attrs_and_maybe_adapt_lights(
+            transition=0, force=True, context=switch.create_context("test")
+        )
+    )
+
+
+def test_highest_priority_wins(hass, listener, light):
+    low = make_switch(hass, [light], **{CONF_PRIORITY: 1})
+    high = make_switch(hass, [light], **{CONF_PRIORITY: 2})
+    make_switch(hass, [light], **{CONF_PRIORITY: 1})
+
+    assert listener.owners[light][0] is low
+    assert listener.owner(light) is high
+
+
+def test_tie_goes_to_the_first_claimer(hass, listener, light):
+    first = make_switch(hass, [light], **{CONF_PRIORITY: 1})
+    make_switch(hass, [light], **{CONF_PRIORITY: 1})
+
+    assert listener.owner(light) is first
+
+
+def test_ownership_moves_when_the_owner_is_off(hass, listener, light):
+    high = make_switch(hass, [light], **{CONF_PRIORITY: 2})
+    low = make_switch(hass, [light], **{CONF_PRIORITY: 1})
+
+    high._state = False
+    assert listener.owner(light) is low
+    high._state = True
+    assert listener.owner(light) is high
+    # Without a switch that is on, the priority still decides
+    high._state = low._state = False
+    assert listener.owner(light) is high
+
+
+def test_other_switch_skips_the_light(hass, listener, light):
+    owner = make_switch(hass, [light], **{CONF_PRIORITY: 2})
+    other = make_switch(hass, [light], **{CONF_PRIORITY: 1})
+
+    adapt(hass, other)
+
+    assert not hass.services.calls
+    entry = listener.record(light).trace[-1]
+    assert (entry.switch, entry.decision) == (other._name, "other_switch")
+    assert other.extra_state_attributes["shared_lights"] == {light: owner.name}
+
+    adapt(hass, owner)
+
+    assert [call[2]["entity_id"] for call in hass.services.calls] == [light]
+    assert listener.record(light).trace[-1].decision == "sent"
@@ -0,0 +1,194 @@
+# pylint: disable=protected-access
+"""Tests of what the `TurnOnOffListener` tracks per light."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from homeassistant.core import Context, Event
+import pytest
+
+from custom_components.artificial_sunlight.const import (
+    ATTR_ADAPT_BRIGHTNESS,
+    ATTR_ADAPT_COLOR,
+    ATTR_TURN_ON_OFF_LISTENER,
+    CONF_EXTEND_CCT_RGB_COLOR,
+    CONF_LIGHTS,
+    CONF_MANUAL_CONTROL,
+    CONF_PREFER_RGB_COLOR,
+    CONF_TRANSITION,
+    CONF_TURN_ON_LIGHTS,
+    DOMAIN,
+)
+from custom_components.artificial_sunlight.switch import (
+    handle_apply,
+    handle_set_manual_control,
+)
+
+from benchmarks.helpers import make_lights, make_switch
+
+
+def adapt(hass, switch, lights=None):
+    """Run a forced adaptation pass of 'switch'."""
+    hass.loop.run_until_complete(
+        switch._update_attrs_and_maybe_adapt_lights(
+            lights, transition=0, force=True, context=switch.create_context("test")
+        )
+    )
+
+
+def test_removing_a_switch_drops_its_records(hass):
+    listener = hass.data[DOMAIN][ATTR_TURN_ON_OFF_LISTENER]
+    lights = make_lights(hass, 2)
+    switch = make_switch(hass, lights)
+    adapt(hass, switch)
+    sleep_task = hass.loop.create_task(asyncio.sleep(3600))
+    listener.record(lights[0]).sleep_task = sleep_task
+    assert listener.records.keys() == set(lights)
+
+    hass.loop.run_until_complete(switch.async_will_remove_from_hass())
+    hass.loop.run_until_complete(asyncio.sleep(0))
+
+    assert not listener.records
+    assert not listener.lights
+    assert not listener.owners
+    assert sleep_task.cancelled()
+
+
+def test_removing_a_light_drops_its_record(hass):
+    listener = hass.data[DOMAIN][ATTR_TURN_ON_OFF_LISTENER]
+    lights = make_lights(hass, 2)
+    hass.states.async_set("light.group", "on", {"entity_id": lights})
+    switch = make_switch(hass, ["light.group"])
+    adapt(hass, switch)
+
+    hass.states.async_set("light.group", "on", {"entity_id": lights[:1]})
+    switch._light_groups_changed({"light.group"})
+
+    assert listener.records.keys() == {lights[0]}
+    assert listener.lights == {lights[0]}
+
+
+def test_services_do_not_track_lights_of_no_switch(hass):
+    listener = hass.data[DOMAIN][ATTR_TURN_ON_OFF_LISTENER]
+    lights = make_lights(hass, 2)
+    switch = make_switch(hass, lights[:1])
+    adapt(hass, switch)
+    data = {
+        CONF_LIGHTS: lights[1:],
+        CONF_TURN_ON_LIGHTS: False,
+        CONF_TRANSITION: 0,
+        ATTR_ADAPT_BRIGHTNESS: True,
+        ATTR_ADAPT_COLOR: True,
+        CONF_PREFER_RGB_COLOR: False,
+        CONF_EXTEND_CCT_RGB_COLOR: False,
+        CONF_MANUAL_CONTROL: True,
+    }
+    service_call = SimpleNamespace(data=data, context=Context())
+
+    hass.loop.run_until_complete(handle_apply(switch, service_call))
+    assert hass.services.calls[-1][2]["entity_id"] == lights[1]
+    hass.loop.run_until_complete(handle_set_manual_control(switch, service_call))
+
+    assert lights[1] not in listener.records
+    assert lights[1] not in listener.lights
+
+
+def test_locks_are_per_switch(hass):
+    listener = hass.data[DOMAIN][ATTR_TURN_ON_OFF_LISTENER]
+    light = make_lights(hass, 1)[0]
+    owner = make_switch(hass, [light])
+    other = make_switch(hass, [light])
+
+    async def adapt_while_other_waits():
+        # E.g., 'other' waits in '_light_event' whether the light turns off again
+        other._locks[light] = lock = asyncio.Lock()
+        async with lock:
+            await owner._update_attrs_and_maybe_adapt_lights(
+                transition=0, force=True, context=owner.create_context("test")
+            )
+
+    hass.loop.run_until_complete(adapt_while_other_waits())
+
+    assert listener.record(light).trace[-1].decision == "sent"
+    assert hass.services.calls
+
+
+def test_trace_records_a_failed_command(hass, monkeypatch):
+    listener = hass.data[DOMAIN][ATTR_TURN_ON_OFF_LISTENER]
+    light = make_lights(hass, 1)[0]
+    switch = make_switch(hass, [light])
+
+    async def unavailable(*args, **kwargs):
+        raise RuntimeError("Light is unavailable")
+
+    monkeypatch.setattr(hass.services, "async_call", unavailable)
+    adapt(hass, switch)
+
+    assert [entry.decision for entry in listener.record(light).trace] == ["failed"]
+    assert listener.record(light).last_service_data is None
+    monkeypatch.undo()
+    adapt(hass, switch)
+
+    assert listener.record(light).trace[-1].decision == "sent"
+
+
+def test_manual_control_warnings_are_forgotten(hass):
+    listener = hass.data[DOMAIN][ATTR_TURN_ON_OFF_LISTENER]
+    lights = make_lights(hass, 2)
+    hass.states.async_set("light.group", "on", {"entity_id": lights})
+    switch = make_switch(hass, ["light.group"])
+    for light in lights:
+        listener.record(light).manual_control = True
+    adapt(hass, switch)
+    assert switch._log._last.keys() == {f"manual:{light}" for light in lights}
+
+    # Manual control of the first light ends, the second light is removed
+    listener.reset(lights[0])
+    adapt(hass, switch)
+    hass.states.async_set("light.group", "on", {"entity_id": lights[:1]})
+    switch._light_groups_changed({"light.group"})
+
+    assert not switch._log._last
+
+
+def test_removing_a_switch_drops_its_contexts(hass):
+    listener = hass.data[DOMAIN][ATTR_TURN_ON_OFF_LISTENER]
+    light = make_lights(hass, 1)[0]
+    removed = make_switch(hass, [light])
+    other = make_switch(hass, [light])
+    adapt(hass, removed)
+    context = other.create_context("test")
+
+    hass.loop.run_until_complete(removed.async_will_remove_from_hass())
+
+    assert list(listener.contexts.values()) == [(other, "test")]
+    assert listener.attribute(context) == (other, "test")
+
+
+@pytest.mark.parametrize(
+    "domain, service, entity_ids, tracked",
+    (
+        ("light", "turn_on", "light.bench_0", True),
+        ("light", "turn_off", ["light.other", "light.bench_0"], True),
+        ("light", "turn_on", "light.other, light.bench_0", True),
+        ("light", "turn_on", "light.other", False),
+        ("light", "turn_off", ["light.other"], False),
+        ("light", "turn_on", None, False),
+        ("light", "toggle", "light.bench_0", False),
+        ("switch", "turn_on", "light.bench_0", False),
+    ),
+)
+def test_only_service_calls_of_tracked_lights_pass(
+    hass, domain, service, entity_ids, tracked
+):
+    listener = hass.data[DOMAIN][ATTR_TURN_ON_OFF_LISTENER]
+    make_switch(hass, make_lights(hass, 1))
+    service_data = {} if entity_ids is None else {"entity_id": entity_ids}
+    event = Event(
+        "call_service",
+        {"domain": domain, "service": service, "service_data": service_data},
+    )
+
+    assert listener._is_tracked_service_call(event) is tracked
@@ -0,0 +1,96 @@
+# pylint: disable=protected-access
+"""Tests of `SunSettings.next_change` and the updates it schedules."""
+
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+from custom_components.artificial_sunlight import switch
+from custom_components.artificial_sunlight.const import (
+    CONF_MAX_COLOR_TEMP,
+    CONF_MIN_COLOR_TEMP,
+    CONF_SUNRISE_OFFSET,
+)
+
+from benchmarks.helpers import NOW, make_lights, make_switch
+
+BRIGHTNESS_STEP = 100 * switch.BRIGHTNESS_DEADBAND / 255
+MIRED_STEP = switch.COLOR_TEMP_DEADBAND
+# The settings are interpolated linearly, but the mired is rounded down
+BRIGHTNESS_TOLERANCE, MIRED_TOLERANCE = 1e-6, 1
+SAMPLE_STEP = 10  # seconds
+
+START = datetime.datetime.combine(NOW.date(), datetime.time(), NOW.tzinfo)
+MOMENTS = [
+    START + datetime.timedelta(minutes=minutes) for minutes in range(0, 1440, 37)
+]
+
+
+def settings_at(curve, timestamps):
+    """Get the brightness and mired that are sent at the 'timestamps'."""
+    return [curve.interpolate(timestamp)[::2][:2] for timestamp in timestamps]
+
+
+@pytest.fixture(params=({}, {CONF_MIN_COLOR_TEMP: 2500, CONF_MAX_COLOR_TEMP: 6000}))
+def settings(hass, request):
+    """Get the `SunSettings` of a switch."""
+    return make_switch(hass, make_lights(hass, 1), **request.param)._sun_light_settings
+
+
+@pytest.mark.parametrize("now", MOMENTS, ids=lambda now: now.strftime("%H:%M"))
+def test_next_change_is_at_a_crossing(settings, now):
+    next_change = settings.next_change(now, False, BRIGHTNESS_STEP, MIRED_STEP)
+    assert next_change > now
+    timestamp, end = now.timestamp(), next_change.timestamp()
+
+    samples = [
+        timestamp + SAMPLE_STEP * index
+        for index in range(1, 1 + int((end - timestamp) // SAMPLE_STEP))
+    ]
+    curve = settings.get_curve(now)
+    (brightness, mired), *values = settings_at(curve, [timestamp, *samples, end])
+    # Nothing visibly changes before 'next_change'
+    for sample_brightness, sample_mired in values:
+        assert (
+            abs(sample_brightness - brightness)
+            <= BRIGHTNESS_STEP + BRIGHTNESS_TOLERANCE
+        )
+        assert abs(sample_mired - mired) <= MIRED_STEP + MIRED_TOLERANCE
+
+    # At 'next_change', a setting changed by a step, or a new segment starts
+    events = settings.get_sun_events(now)
+    boundaries = [getattr(events, name) for name in switch._SEGMENT_BOUNDARIES]
+    end_of_curve = curve.start + (len(curve.night) - 1) * curve.step
+    end_brightness, end_mired = values[-1]
+    brightness_change = abs(end_brightness - brightness)
+    mired_change = abs(end_mired - mired)
+    assert (
+        abs(brightness_change - BRIGHTNESS_STEP) <= BRIGHTNESS_TOLERANCE
+        or abs(mired_change - MIRED_STEP) <= MIRED_TOLERANCE
+        or min(abs(end - boundary) for boundary in boundaries) < 1e-3
+        or curve.night[int((end - curve.start) // curve.step)]
+        != curve.night[int((timestamp - curve.start) // curve.step)]
+        or end == end_of_curve
+    )
+
+
+def test_next_change_is_none_in_sleep_mode(settings):
+    assert settings.next_change(NOW, True, BRIGHTNESS_STEP, MIRED_STEP) is None
+
+
+def test_unsolvable_day_falls_back_to_the_interval(hass, monkeypatch):
+    # An offset that moves sunrise past noon
+    sw = make_switch(hass, make_lights(hass, 1), **{CONF_SUNRISE_OFFSET: 10 * 3600})
+    scheduled = []
+    monkeypatch.setattr(switch.dt_util, "utcnow", lambda: NOW)
+    monkeypatch.setattr(
+        switch,
+        "async_track_point_in_utc_time",
+        lambda hass, action, point_in_time: scheduled.append(point_in_time),
+    )
+
+    sw._schedule_next_update()
+
+    assert scheduled == [NOW + sw._interval]
@@ -0,0 +1,80 @@
+# pylint: disable=protected-access
+"""Tests of the polls before `significant_change` with `detect_non_ha_changes`."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.artificial_sunlight.const import (
+    ATTR_TURN_ON_OFF_LISTENER,
+    CONF_DETECT_NON_HA_CHANGES,
+    CONF_MAX_STATE_AGE,
+    CONF_POLL_BUDGET,
+    DOMAIN,
+)
+
+from benchmarks.helpers import make_lights, make_switch
+
+N_LIGHTS, POLL_BUDGET = 5, 2
+
+
+@pytest.fixture
+def polled(hass, monkeypatch):
+    """Record the lights that are polled."""
+    polled: list[str] = []
+
+    async def async_update_entity(entity_id: str) -> None:
+        polled.append(entity_id)
+
+    monkeypatch.setattr(
+        hass.helpers.entity_component, "async_update_entity", async_update_entity
+    )
+    return polled
+
+
+def adapt(hass, switch, force=False):
+    """Run an adaptation pass of 'switch'."""
+    hass.loop.run_until_complete(
+        switch._update_attrs_and_maybe_adapt_lights(
+            transition=0, force=force, context=switch.create_context("test")
+        )
+    )
+
+
+def test_poll_budget_rotates_over_the_lights(hass, polled):
+    lights = make_lights(hass, N_LIGHTS)
+    switch = make_switch(
+        hass,
+        lights,
+        **{CONF_DETECT_NON_HA_CHANGES: True, CONF_POLL_BUDGET: POLL_BUDGET},
+    )
+    adapt(hass, switch, force=True)  # Nothing to compare to yet, so no polls
+    assert not polled
+
+    passes = []
+    for _ in range(3):
+        adapt(hass, switch)
+        passes.append(polled[:])
+        polled.clear()
+
+    assert [len(lights_polled) for lights_polled in passes] == [POLL_BUDGET] * 3
+    # The lights that were polled longest ago (or never) go first
+    assert set(passes[0]).isdisjoint(passes[1])
+    (never_polled,) = set(lights).difference(passes[0], passes[1])
+    assert never_polled in passes[2]
+    assert switch.counters["polled_lights"] == 3 * POLL_BUDGET
+
+
+def test_fresh_states_are_not_polled(hass, polled):
+    listener = hass.data[DOMAIN][ATTR_TURN_ON_OFF_LISTENER]
+    lights = make_lights(hass, N_LIGHTS)
+    switch = make_switch(
+        hass, lights, **{CONF_DETECT_NON_HA_CHANGES: True, CONF_MAX_STATE_AGE: 60}
+    )
+    adapt(hass, switch, force=True)
+    # The light reported its state over a minute ago
+    listener.record(lights[0]).last_reported -= 120
+
+    adapt(hass, switch)
+
+    assert polled == lights[:1]
@@ -0,0 +1,126 @@
+# pylint: disable=protected-access
+"""Tests of the second command of `separate_turn_on_commands`."""
+
+from __future__ import annotations
+
+from homeassistant.core import Context
+import pytest
+
+from custom_components.artificial_sunlight import switch
+from custom_components.artificial_sunlight.const import CONF_SEPARATE_TURN_ON_COMMANDS
+
+from benchmarks.helpers import make_lights, make_switch
+
+TRANSITION = 10  # seconds, the first command takes half of it
+
+
+class FakeTimers:
+    """Replace 'async_call_later' with timers that run when time is advanced."""
+
+    def __init__(self, hass) -> None:
+        self._hass = hass
+        self.now = 0.0
+        self._timers: list[list] = []  # [when, action, cancelled]
+
+    def call_later(self, hass, delay, action):
+        timer = [self.now + delay, action, False]
+        self._timers.append(timer)
+
+        def cancel() -> None:
+            timer[2] = True
+
+        return cancel
+
+    @property
+    def pending(self) -> int:
+        return sum(not cancelled for _, _, cancelled in self._timers)
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+        due = [timer for timer in self._timers if timer[0] <= self.now]
+        for timer in due:
+            self._timers.remove(timer)
+            if not timer[2]:
+                self._hass.loop.run_until_complete(timer[1](None))
+
+
+@pytest.fixture
+def timers(hass, monkeypatch):
+    """Schedule the second commands on `FakeTimers`."""
+    timers = FakeTimers(hass)
+    monkeypatch.setattr(switch, "async_call_later", timers.call_later)
+    return timers
+
+
+@pytest.fixture
+def light(hass):
+    """Add a light."""
+    return make_lights(hass, 1)[0]
+
+
+@pytest.fixture
+def sw(hass, light):
+    """Create a switch that sends separate color and brightness commands."""
+    return make_switch(hass, [light], **{CONF_SEPARATE_TURN_ON_COMMANDS: True})
+
+
+def adapt(hass, sw):
+    """Run a forced adaptation pass of 'sw' with a transition."""
+    hass.loop.run_until_complete(
+        sw._update_attrs_and_maybe_adapt_lights(
+            transition=TRANSITION, force=True, context=sw.create_context("test")
+        )
+    )
+
+
+def brightness_commands(hass):
+    """Get the 'light.turn_on' calls that set the brightness."""
+    return [data for _, _, data in hass.services.calls if "brightness" in data]
+
+
+def test_second_command_is_sent_after_the_transition(hass, timers, sw):
+    adapt(hass, sw)
+    assert len(hass.services.calls) == 1
+    assert not brightness_commands(hass)
+
+    timers.advance(TRANSITION / 2)
+
+    assert len(brightness_commands(hass)) == 1
+    assert not sw._second_commands
+
+
+def test_new_pass_supersedes_the_second_command(hass, timers, sw):
+    adapt(hass, sw)
+    timers.advance(TRANSITION / 4)
+    adapt(hass, sw)
+    assert timers.pending == 1
+
+    timers.advance(TRANSITION / 4)  # The first pass would be done now
+    assert not brightness_commands(hass)
+    timers.advance(TRANSITION / 4)
+    assert len(brightness_commands(hass)) == 1
+
+
+def test_manual_change_cancels_the_second_command(hass, timers, sw, light):
+    adapt(hass, sw)
+    manual = {"entity_id": light, "brightness": 10}
+    hass.loop.run_until_complete(
+        hass.services.async_call("light", "turn_on", manual, context=Context())
+    )
+
+    timers.advance(TRANSITION / 2)
+
+    assert brightness_commands(hass) == [manual]
+    assert hass.states.get(light).attributes["brightness"] == 10
+
+
+def test_turning_off_cancels_the_second_command(hass, timers, sw, light):
+    sw._track_lights()
+    adapt(hass, sw)
+    hass.states.async_set(light, "off")
+    hass.loop.run_until_complete(hass.async_block_till_done())
+
+    timers.advance(TRANSITION / 2)
+
+    assert not brightness_commands(hass)
+    assert timers.pending == 0